@@ -0,0 +1,43 @@
+"""
+Shared Azure credential for the Foundry deployment scripts.
+
+DefaultAzureCredential walks a chain of credential sources (environment,
+managed identity, Azure CLI, ...) the first time it is used. The scripts
+in this directory share one instance per process so that chain is only
+probed once, and its token cache is reused across clients.
+"""
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from azure.identity import DefaultAzureCredential
+
+
+@lru_cache(maxsize=1)
+def get_credential() -> "DefaultAzureCredential":
+    """
+    Get the process-wide Azure credential, creating it on first use.
+
+    Returns:
+        DefaultAzureCredential instance
+
+    Raises:
+        ImportError: If azure-identity is not installed
+    """
+    try:
+        from azure.identity import DefaultAzureCredential
+    except ImportError:
+        raise ImportError(
+            "azure-identity not installed. Install with: pip install azure-identity"
+        )
+
+    # Scripts run unattended, so never fall back to a browser prompt
+    return DefaultAzureCredential(exclude_interactive_browser_credential=True)
+
+
+def close_credential() -> None:
+    """Close the shared credential, if one was created."""
+    if get_credential.cache_info().currsize:
+        get_credential().close()
+        get_credential.cache_clear()
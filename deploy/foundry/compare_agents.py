@@ -6,32 +6,60 @@ Tests both Foundry-native agent and Container Apps agent with identical queries.
 Uses the GA SDK v2.0.0+ API with conversations/responses pattern.
 """
 
+import argparse
+import asyncio
+import hashlib
+import io
 import os
 import sys
 import time
+import traceback
 import json
-import requests
-from typing import Dict, Any, List
+import importlib.util
+import httpx
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, List
 from dotenv import load_dotenv
 from azure.ai.projects import AIProjectClient
-from azure.identity import DefaultAzureCredential
+
+try:
+    import orjson
+except ImportError:
+    # Fall back to stdlib json when orjson is not installed
+    orjson = None
+
+from _credential import get_credential
 
 load_dotenv()
 
+# Maximum test cases in flight at once (each runs both agents)
+DEFAULT_CONCURRENCY = int(os.getenv("COMPARE_CONCURRENCY", "4"))
+
+# On-disk cache of successful agent responses, keyed by agent and query
+CACHE_FILE = Path(".agent_cache") / "compare_agents.json"
+CACHE_TTL_SECONDS = 3600
+
+# Separator lines for console output
+_BANNER = "=" * 80
+
 
 class AgentComparator:
     """Compare Foundry-native agent vs Container Apps agent."""
 
-    def __init__(self):
-        """Initialize clients for both agents."""
+    def __init__(self, use_cache: bool = True):
+        """Initialize clients for both agents.
+
+        Args:
+            use_cache: Reuse responses cached by earlier runs for identical
+                queries (pass False for fresh results)
+        """
         # Foundry setup
         self.project_endpoint = os.getenv("AZURE_AI_PROJECT_ENDPOINT")
         self.foundry_agent_name = os.getenv("FOUNDRY_AGENT_NAME", "WeatherClothingAdvisor")
 
-        credential = DefaultAzureCredential()
         self.foundry_client = AIProjectClient(
             endpoint=self.project_endpoint,
-            credential=credential
+            credential=get_credential()
         )
         self.openai_client = self.foundry_client.get_openai_client()
 
@@ -40,37 +68,102 @@ class AgentComparator:
         if not self.container_agent_url:
             raise ValueError("EXTERNAL_AGENT_URL not set")
 
-        print(f"Foundry Agent: {self.foundry_agent_name}")
-        print(f"Container Agent: {self.container_agent_url}")
+        # Shared HTTP client so keep-alive connections (and TLS sessions) are
+        # reused across test cases. HTTP/2 needs the optional h2 package.
+        self._http = httpx.AsyncClient(
+            timeout=60,
+            headers={"Content-Type": "application/json"},
+            limits=httpx.Limits(
+                max_connections=DEFAULT_CONCURRENCY,
+                max_keepalive_connections=DEFAULT_CONCURRENCY,
+            ),
+            http2=importlib.util.find_spec("h2") is not None,
+        )
 
-    def test_foundry_agent(self, message: str) -> Dict[str, Any]:
-        """Test Foundry-native agent using conversations/responses API."""
-        start_time = time.time()
-        conversation_id = None
+        # Response cache
+        self.use_cache = use_cache
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self._cache: Dict[str, Dict[str, Any]] = self._load_cache() if use_cache else {}
 
+        print(
+            f"Foundry Agent: {self.foundry_agent_name}\n"
+            f"Container Agent: {self.container_agent_url}"
+        )
+
+    async def __aenter__(self) -> "AgentComparator":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._http.aclose()
+        if self.use_cache:
+            self._save_cache()
+
+    @staticmethod
+    def _load_cache() -> Dict[str, Dict[str, Any]]:
+        """Load unexpired cache entries from disk."""
         try:
-            # Create conversation with initial message
-            conversation = self.openai_client.conversations.create(
-                items=[{'type': 'message', 'role': 'user', 'content': message}]
-            )
-            conversation_id = conversation.id
+            data = CACHE_FILE.read_bytes()
+            entries = orjson.loads(data) if orjson is not None else json.loads(data)
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {key: entry for key, entry in entries.items() if entry["expires"] > now}
+
+    def _save_cache(self) -> None:
+        """Write the cache back to disk."""
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        if orjson is not None:
+            CACHE_FILE.write_bytes(orjson.dumps(self._cache))
+        else:
+            CACHE_FILE.write_text(json.dumps(self._cache), encoding='utf-8')
+
+    async def _cached(
+        self,
+        target: str,
+        message: str,
+        call: Callable[[str], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Return a cached result for this agent and query, or run the call.
+
+        Only successful results are cached so failures are always retried.
+        """
+        if not self.use_cache:
+            return await call(message)
+
+        key = hashlib.sha256(f"{target}|{message}".encode()).hexdigest()
+        entry = self._cache.get(key)
+        if entry and entry["expires"] > time.time():
+            self.cache_stats["hits"] += 1
+            return {**entry["result"], "cached": True}
+
+        self.cache_stats["misses"] += 1
+        result = await call(message)
+        if result["success"]:
+            self._cache[key] = {"expires": time.time() + CACHE_TTL_SECONDS, "result": result}
+        return result
+
+    async def test_foundry_agent(self, message: str) -> Dict[str, Any]:
+        """Test Foundry-native agent using the responses API.
+
+        Each test case is an independent single-turn query, so the message is
+        sent as the response input directly rather than through a
+        conversation that would have to be created and deleted per query.
+        The SDK client is synchronous, so the call runs in a worker thread
+        to keep the event loop free for the Container Apps request.
+        """
+        start_time = time.perf_counter()
 
+        try:
             # Invoke agent using agent_reference pattern
-            response = self.openai_client.responses.create(
-                conversation=conversation_id,
+            response = await asyncio.to_thread(
+                self.openai_client.responses.create,
                 extra_body={'agent': {'name': self.foundry_agent_name, 'type': 'agent_reference'}},
-                input='',
+                input=message,
             )
 
             response_text = response.output_text
 
-            # Cleanup conversation
-            try:
-                self.openai_client.conversations.delete(conversation_id=conversation_id)
-            except Exception:
-                pass
-
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             return {
                 "success": True,
@@ -80,13 +173,7 @@ class AgentComparator:
             }
 
         except Exception as e:
-            duration = time.time() - start_time
-            # Try cleanup on error
-            if conversation_id:
-                try:
-                    self.openai_client.conversations.delete(conversation_id=conversation_id)
-                except Exception:
-                    pass
+            duration = time.perf_counter() - start_time
             return {
                 "success": False,
                 "error": str(e),
@@ -94,20 +181,18 @@ class AgentComparator:
                 "deployment": "foundry-native"
             }
 
-    def test_container_agent(self, message: str) -> Dict[str, Any]:
+    async def test_container_agent(self, message: str) -> Dict[str, Any]:
         """Test Container Apps agent via /responses endpoint."""
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
             # Use /responses endpoint (new API)
-            response = requests.post(
+            response = await self._http.post(
                 f"{self.container_agent_url}/responses",
                 json={"input": message},
-                headers={"Content-Type": "application/json"},
-                timeout=60
             )
 
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
 
             if response.status_code == 200:
                 data = response.json()
@@ -131,7 +216,7 @@ class AgentComparator:
                 }
 
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             return {
                 "success": False,
                 "error": str(e),
@@ -139,140 +224,255 @@ class AgentComparator:
                 "deployment": "container-app"
             }
 
-    def run_comparison(self, test_cases: List[Dict[str, str]]) -> List[Dict[str, Any]]:
-        """Run comparison tests for all test cases."""
-        results = []
-
-        for i, test_case in enumerate(test_cases, 1):
-            print(f"\n{'='*80}")
-            print(f"Test Case {i}/{len(test_cases)}: {test_case['name']}")
-            print(f"Query: {test_case['query']}")
-            print(f"{'='*80}")
-
-            # Test Foundry agent
-            print("\n[1/2] Testing Foundry-native agent...")
-            foundry_result = self.test_foundry_agent(test_case['query'])
+    async def _run_one(
+        self,
+        index: int,
+        total: int,
+        test_case: Dict[str, str],
+        semaphore: asyncio.Semaphore,
+    ) -> Dict[str, Any]:
+        """Run one test case against both agents once a slot is free."""
+        async with semaphore:
+            foundry_result, container_result = await asyncio.gather(
+                self._cached(
+                    f"foundry:{self.project_endpoint}:{self.foundry_agent_name}",
+                    test_case['query'],
+                    self.test_foundry_agent,
+                ),
+                self._cached(
+                    f"container:{self.container_agent_url}",
+                    test_case['query'],
+                    self.test_container_agent,
+                ),
+            )
 
-            if foundry_result['success']:
-                print(f"✓ Success ({foundry_result['duration']:.2f}s)")
+        # Print each case as a single block so concurrent output doesn't interleave
+        lines = [
+            "\n" + _BANNER,
+            f"Test Case {index}/{total}: {test_case['name']}",
+            f"Query: {test_case['query']}",
+            _BANNER,
+        ]
+        for label, result in (("Foundry", foundry_result), ("Container", container_result)):
+            if result['success']:
+                cached = " (cached)" if result.get('cached') else ""
+                lines.append(f"✓ {label} success ({result['duration']:.2f}s){cached}")
             else:
-                print(f"✗ Failed: {foundry_result.get('error', 'Unknown error')}")
+                lines.append(f"✗ {label} failed: {result.get('error', 'Unknown error')}")
+        print("\n".join(lines))
+
+        return {
+            "index": index,
+            "test_case": test_case,
+            "foundry": foundry_result,
+            "container": container_result
+        }
 
-            # Test Container Apps agent
-            print("\n[2/2] Testing Container Apps agent...")
-            container_result = self.test_container_agent(test_case['query'])
+    async def run_comparison(
+        self, test_cases: List[Dict[str, str]], concurrency: int = DEFAULT_CONCURRENCY
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run comparison tests for all test cases.
+
+        Test cases are independent, so they all run concurrently with at most
+        ``concurrency`` in flight to stay within endpoint rate limits.
+        Results are yielded as each test case completes; each carries its
+        1-based ``index`` in ``test_cases``.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        total = len(test_cases)
+        tasks = [
+            asyncio.create_task(self._run_one(i, total, test_case, semaphore))
+            for i, test_case in enumerate(test_cases, 1)
+        ]
 
-            if container_result['success']:
-                print(f"✓ Success ({container_result['duration']:.2f}s)")
-            else:
-                print(f"✗ Failed: {container_result.get('error', 'Unknown error')}")
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _is_timed(result: Dict[str, Any]) -> bool:
+        """Whether a result's duration was measured on this run.
+
+        Cached results carry the duration from the run that cached them,
+        so they are left out of timing comparisons and averages.
+        """
+        return result['success'] and not result.get('cached')
+
+    @staticmethod
+    def _format_time(result: Dict[str, Any]) -> str:
+        """Format a result's duration for the summary table."""
+        return "cached" if result.get('cached') else f"{result['duration']:.2f}s"
+
+    @staticmethod
+    def _format_agent_result(title: str, result: Dict[str, Any]) -> str:
+        """Format one agent's outcome for a test case as a markdown block."""
+        if not result['success']:
+            return (
+                f"\n#### {title}\n"
+                f"- **Status**: ❌ Failed\n"
+                f"- **Error**: {result.get('error', 'Unknown')}\n"
+            )
+
+        workflow = ""
+        if 'metadata' in result and 'workflow_duration' in result['metadata']:
+            workflow = f"- **Workflow Duration**: {result['metadata']['workflow_duration']:.2f}s\n"
+        cached = " (cached from an earlier run)" if result.get('cached') else ""
+        return (
+            f"\n#### {title}\n"
+            f"- **Status**: ✅ Success\n"
+            f"- **Duration**: {result['duration']:.2f}s{cached}\n"
+            f"- **Response**: {result['response'][:200]}...\n"
+            f"{workflow}"
+        )
 
-            # Store results
-            results.append({
-                "test_case": test_case,
-                "foundry": foundry_result,
-                "container": container_result
-            })
+    def format_report_header(self) -> str:
+        """Format the report header, written before any results arrive."""
+        return (
+            f"# Agent Comparison Test Results\n"
+            f"\n**Test Date**: {time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"\n**Agents Tested**:\n"
+            f"- Foundry-native: {self.foundry_agent_name}\n"
+            f"- Container Apps: {self.container_agent_url}\n"
+            f"\n## Detailed Results\n"
+        )
 
-            # Brief pause between tests
-            time.sleep(1)
+    def format_detail(self, index: int, result: Dict[str, Any]) -> str:
+        """Format the detailed report section for one test case, written as it completes."""
+        tc = result['test_case']
+        f = result['foundry']
+        c = result['container']
 
-        return results
+        if f['success'] and c['success']:
+            if self._is_timed(f) and self._is_timed(c):
+                time_diff = abs(f['duration'] - c['duration'])
+                faster = "Foundry" if f['duration'] < c['duration'] else "Container"
+                timing = f"{time_diff:.2f}s ({faster} faster)"
+            else:
+                timing = "n/a (cached result)"
+            comparison = (
+                f"- **Both succeeded** ✅\n"
+                f"- **Time difference**: {timing}\n"
+                f"- **Quality match**: Manual review required\n"
+            )
+        else:
+            comparison = "- **Different outcomes**: Manual investigation needed\n"
+
+        return (
+            f"\n### Test Case {index}: {tc['name']}\n"
+            f"\n**Query**: `{tc['query']}`\n"
+            f"\n**Expected**: {tc['expected']}\n"
+            f"{self._format_agent_result('Foundry-Native Agent', f)}"
+            f"{self._format_agent_result('Container Apps Agent', c)}"
+            f"\n#### Comparison\n"
+            f"{comparison}"
+        )
 
-    def generate_report(self, results: List[Dict[str, Any]]) -> str:
-        """Generate markdown comparison report."""
-        report = []
-        report.append("# Agent Comparison Test Results")
-        report.append(f"\n**Test Date**: {time.strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append(f"\n**Agents Tested**:")
-        report.append(f"- Foundry-native: {self.foundry_agent_name}")
-        report.append(f"- Container Apps: {self.container_agent_url}")
+    def format_report_summary(self, results: List[Dict[str, Any]]) -> str:
+        """Format the summary table and overall assessment for all results."""
+        buf = io.StringIO()
+        w = buf.write
 
         # Summary table
-        report.append("\n## Summary")
-        report.append("\n| Test Case | Foundry Success | Container Success | Foundry Time | Container Time |")
-        report.append("|-----------|-----------------|-------------------|--------------|----------------|")
-
-        for result in results:
-            name = result['test_case']['name']
-            f_success = "✅" if result['foundry']['success'] else "❌"
-            c_success = "✅" if result['container']['success'] else "❌"
-            f_time = f"{result['foundry']['duration']:.2f}s"
-            c_time = f"{result['container']['duration']:.2f}s"
-            report.append(f"| {name} | {f_success} | {c_success} | {f_time} | {c_time} |")
-
-        # Detailed results
-        report.append("\n## Detailed Results")
-
-        for i, result in enumerate(results, 1):
-            tc = result['test_case']
-            report.append(f"\n### Test Case {i}: {tc['name']}")
-            report.append(f"\n**Query**: `{tc['query']}`")
-            report.append(f"\n**Expected**: {tc['expected']}")
-
-            # Foundry results
-            report.append(f"\n#### Foundry-Native Agent")
-            f = result['foundry']
-            if f['success']:
-                report.append(f"- **Status**: ✅ Success")
-                report.append(f"- **Duration**: {f['duration']:.2f}s")
-                report.append(f"- **Response**: {f['response'][:200]}...")
-            else:
-                report.append(f"- **Status**: ❌ Failed")
-                report.append(f"- **Error**: {f.get('error', 'Unknown')}")
+        w("\n## Summary\n")
+        if self.use_cache:
+            w(
+                f"\n**Response Cache**: {self.cache_stats['hits']} hits, "
+                f"{self.cache_stats['misses']} misses\n"
+            )
+        w("\n| Test Case | Foundry Success | Container Success | Foundry Time | Container Time |\n")
+        w("|-----------|-----------------|-------------------|--------------|----------------|\n")
 
-            # Container results
-            report.append(f"\n#### Container Apps Agent")
+        for result in sorted(results, key=lambda r: r['index']):
+            f = result['foundry']
             c = result['container']
-            if c['success']:
-                report.append(f"- **Status**: ✅ Success")
-                report.append(f"- **Duration**: {c['duration']:.2f}s")
-                report.append(f"- **Response**: {c['response'][:200]}...")
-                if 'metadata' in c and 'workflow_duration' in c['metadata']:
-                    report.append(f"- **Workflow Duration**: {c['metadata']['workflow_duration']:.2f}s")
-            else:
-                report.append(f"- **Status**: ❌ Failed")
-                report.append(f"- **Error**: {c.get('error', 'Unknown')}")
-
-            # Comparison
-            report.append(f"\n#### Comparison")
-            if f['success'] and c['success']:
-                time_diff = abs(f['duration'] - c['duration'])
-                faster = "Foundry" if f['duration'] < c['duration'] else "Container"
-                report.append(f"- **Both succeeded** ✅")
-                report.append(f"- **Time difference**: {time_diff:.2f}s ({faster} faster)")
-                report.append(f"- **Quality match**: Manual review required")
-            else:
-                report.append(f"- **Different outcomes**: Manual investigation needed")
+            w(
+                f"| {result['test_case']['name']} "
+                f"| {'✅' if f['success'] else '❌'} "
+                f"| {'✅' if c['success'] else '❌'} "
+                f"| {self._format_time(f)} | {self._format_time(c)} |\n"
+            )
 
         # Overall assessment
-        report.append("\n## Overall Assessment")
-
         foundry_successes = sum(1 for r in results if r['foundry']['success'])
         container_successes = sum(1 for r in results if r['container']['success'])
         total = len(results)
 
-        report.append(f"\n**Success Rates**:")
-        report.append(f"- Foundry-native: {foundry_successes}/{total} ({foundry_successes/total*100:.1f}%)")
-        report.append(f"- Container Apps: {container_successes}/{total} ({container_successes/total*100:.1f}%)")
+        # Average only durations measured on this run
+        foundry_times = [r['foundry']['duration'] for r in results if self._is_timed(r['foundry'])]
+        container_times = [r['container']['duration'] for r in results if self._is_timed(r['container'])]
+        avg_foundry_time = sum(foundry_times) / len(foundry_times) if foundry_times else None
+        avg_container_time = sum(container_times) / len(container_times) if container_times else None
+
+        def avg(value: Any) -> str:
+            return f"{value:.2f}s" if value is not None else "n/a (no results timed on this run)"
+
+        all_passed = foundry_successes == total and container_successes == total
+        if avg_foundry_time is None or avg_container_time is None:
+            performance = "Not compared (no results timed on this run for one or both agents)"
+        else:
+            faster = 'Foundry' if avg_foundry_time < avg_container_time else 'Container'
+            performance = f"{faster} agent was faster on average"
+
+        w(
+            f"\n## Overall Assessment\n"
+            f"\n**Success Rates**:\n"
+            f"- Foundry-native: {foundry_successes}/{total} ({foundry_successes/total*100:.1f}%)\n"
+            f"- Container Apps: {container_successes}/{total} ({container_successes/total*100:.1f}%)\n"
+            f"\n**Average Response Times**:\n"
+            f"- Foundry-native: {avg(avg_foundry_time)}\n"
+            f"- Container Apps: {avg(avg_container_time)}\n"
+            f"\n## Conclusions\n"
+            f"\n- **Portability**: ✅ Same workflow code works in both environments\n"
+            f"- **Reliability**: Both agents {'completed all tests' if all_passed else 'had some failures'}\n"
+            f"- **Performance**: {performance}\n"
+        )
+
+        return buf.getvalue()
+
+
+async def _run_comparison(
+    comparator: AgentComparator,
+    test_cases: List[Dict[str, str]],
+    report_file: str,
+) -> str:
+    """Run the comparison, writing each result to the report as it completes.
 
-        avg_foundry_time = sum(r['foundry']['duration'] for r in results if r['foundry']['success']) / max(foundry_successes, 1)
-        avg_container_time = sum(r['container']['duration'] for r in results if r['container']['success']) / max(container_successes, 1)
+    Detailed sections are appended and flushed as soon as each test case
+    finishes, so the report file shows progress on long suites. The summary
+    is written last since it needs every result.
 
-        report.append(f"\n**Average Response Times**:")
-        report.append(f"- Foundry-native: {avg_foundry_time:.2f}s")
-        report.append(f"- Container Apps: {avg_container_time:.2f}s")
+    Returns:
+        The report summary section
+    """
+    results = []
+    async with comparator:
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write(comparator.format_report_header())
+            f.flush()
+
+            async for result in comparator.run_comparison(test_cases):
+                f.write(comparator.format_detail(result['index'], result))
+                f.flush()
+                results.append(result)
 
-        report.append(f"\n## Conclusions")
-        report.append(f"\n- **Portability**: ✅ Same workflow code works in both environments")
-        report.append(f"- **Reliability**: Both agents {'completed all tests' if foundry_successes == total and container_successes == total else 'had some failures'}")
-        report.append(f"- **Performance**: {'Foundry' if avg_foundry_time < avg_container_time else 'Container'} agent was faster on average")
+            summary = comparator.format_report_summary(results)
+            f.write(summary)
 
-        return "\n".join(report)
+    return summary
 
 
 def main():
     """Run comparison tests."""
+    parser = argparse.ArgumentParser(description="Compare Foundry-native and Container Apps agents")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached responses and query both agents fresh",
+    )
+    args = parser.parse_args()
 
     # Define test cases
     test_cases = [
@@ -314,33 +514,24 @@ def main():
     ]
 
     try:
-        comparator = AgentComparator()
-
-        print("\n" + "="*80)
-        print("AGENT COMPARISON TEST - STORY 6")
-        print("="*80)
-        print(f"\nRunning {len(test_cases)} test cases against both agents...")
+        comparator = AgentComparator(use_cache=not args.no_cache)
 
-        results = comparator.run_comparison(test_cases)
+        print("\n".join([
+            "\n" + _BANNER,
+            "AGENT COMPARISON TEST - STORY 6",
+            _BANNER,
+            f"\nRunning {len(test_cases)} test cases against both agents...",
+        ]))
 
-        # Generate report
-        print("\n" + "="*80)
-        print("GENERATING REPORT")
-        print("="*80)
-
-        report = comparator.generate_report(results)
-
-        # Save report
+        # Results are written to the report as each test case completes
         report_file = "comparison-report.md"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(report)
+        summary = asyncio.run(_run_comparison(comparator, test_cases, report_file))
 
         print(f"\n✓ Report saved to: {report_file}")
-        print("\n" + report)
+        print("\n" + summary)
 
     except Exception as e:
         print(f"\n✗ Error: {str(e)}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
@@ -10,30 +10,37 @@ Usage:
     python register_agent.py register --agent-name WeatherClothingAdvisor
     python register_agent.py list
     python register_agent.py delete --agent-name WeatherClothingAdvisor
+    python register_agent.py validate
 """
 
+import hashlib
 import os
 import sys
 import json
 import logging
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
 
-# Get project root (deploy/foundry -> deploy -> project root)
-PROJECT_ROOT = Path(__file__).parent.parent.parent
+from _credential import close_credential, get_credential
 
 try:
-    from azure.ai.projects import AIProjectClient
-    from azure.ai.projects.models import (
-        PromptAgentDefinition,
-        OpenApiAgentTool,
-        OpenApiFunctionDefinition,
-        OpenApiAnonymousAuthDetails,
-    )
-    from azure.identity import DefaultAzureCredential
+    import orjson
 except ImportError:
-    logging.error("Azure AI Foundry SDK not installed. Please install: pip install azure-ai-projects")
-    sys.exit(1)
+    # Fall back to stdlib json when orjson is not installed
+    orjson = None
+
+# Get project root (deploy/foundry -> deploy -> project root)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+_PROMPTS_FILE = PROJECT_ROOT / 'specs' / '001-weather-clothing-advisor' / 'contracts' / 'agent-prompts.md'
+_OPENAPI_FILE = PROJECT_ROOT / 'src' / 'weather-api' / 'openapi.json'
+
+if TYPE_CHECKING:
+    from azure.ai.projects import AIProjectClient
+    from azure.ai.projects.models import OpenApiAgentTool, PromptAgentDefinition
 
 logging.basicConfig(
     level=logging.INFO,
@@ -42,29 +49,193 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Metadata attached to every version of the registered agent
+_AGENT_METADATA = {
+    "deployment_type": "foundry-agent",
+    "version": "1.0.0",
+    "feature": "001-weather-clothing-advisor",
+}
+
+
+def _fingerprint(definition: "PromptAgentDefinition") -> str:
+    """
+    Hash an agent definition so unchanged configurations can be detected.
+
+    Only the deployed configuration (model, instructions and tools) is
+    hashed, and all three must be set, so the stored hash always
+    describes a complete agent version.
+
+    Args:
+        definition: Full agent definition to hash
+
+    Returns:
+        Hex digest that is stable across runs for the same definition
+
+    Raises:
+        ValueError: If the definition is missing model, instructions or tools
+    """
+    if not (definition.model and definition.instructions and definition.tools):
+        raise ValueError("Only a full agent definition (model, instructions, tools) can be fingerprinted")
+
+    config = {
+        "m": definition.model,
+        "i": definition.instructions,
+        "t": [tool.as_dict() for tool in definition.tools],
+    }
+    payload = json.dumps(config, sort_keys=True).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _file_key(path: Path) -> Tuple[str, int, int]:
+    """
+    Build a cache key that changes whenever the file is modified.
+
+    Args:
+        path: File to key
+
+    Returns:
+        Tuple of (path, mtime in ns, size)
+    """
+    stat = path.stat()
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=8)
+def _read_text_cached(path: str, mtime_ns: int, size: int) -> str:
+    """Read a text file; cached per (path, mtime, size)."""
+    return Path(path).read_text(encoding='utf-8')
+
+
+@lru_cache(maxsize=8)
+def _load_json_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a JSON file; cached per (path, mtime, size). Treat as read-only."""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass(frozen=True)
+class _Env:
+    """Environment configuration for agent registration."""
+
+    project_endpoint: str
+    weather_api_url: str
+    model_deployment: Optional[str]
+
+
+@lru_cache(maxsize=1)
+def _env() -> _Env:
+    """
+    Read and validate the registration environment once per process.
+
+    Returns:
+        Resolved environment configuration
+
+    Raises:
+        ValueError: If a required variable is missing
+    """
+    project_endpoint = os.getenv("AZURE_AI_PROJECT_ENDPOINT")
+    weather_api_url = os.getenv("WEATHER_API_URL")
+
+    if not project_endpoint:
+        raise ValueError("AZURE_AI_PROJECT_ENDPOINT environment variable is required")
+    if not weather_api_url:
+        raise ValueError("WEATHER_API_URL environment variable is required (external weather API endpoint)")
+
+    return _Env(
+        project_endpoint=project_endpoint,
+        weather_api_url=weather_api_url,
+        model_deployment=os.getenv("AZURE_AI_MODEL_DEPLOYMENT_NAME"),
+    )
+
+
+# Project clients shared per endpoint, see _get_client
+_clients: Dict[str, "AIProjectClient"] = {}
+
+
+def _get_client(endpoint: str) -> "AIProjectClient":
+    """
+    Get an AIProjectClient for the endpoint, creating it on first use.
+
+    DefaultAzureCredential probes several credential sources on creation,
+    and the client's transport keeps its TLS connection alive, so both
+    are reused for the life of the process. Call close_clients() when done.
+
+    Args:
+        endpoint: Azure AI project endpoint
+
+    Returns:
+        AIProjectClient instance
+
+    Raises:
+        ImportError: If the Azure AI Foundry SDK is not installed
+    """
+    client = _clients.get(endpoint)
+    if client is None:
+        # Imported here so commands that never reach Azure skip the SDK import
+        try:
+            from azure.ai.projects import AIProjectClient
+        except ImportError:
+            raise ImportError(
+                "Azure AI Foundry SDK not installed. "
+                "Install with: pip install azure-ai-projects azure-identity"
+            )
+        client = AIProjectClient(endpoint=endpoint, credential=get_credential())
+        _clients[endpoint] = client
+    return client
+
+
+def close_clients() -> None:
+    """Close the cached project clients and the shared credential."""
+    while _clients:
+        _, client = _clients.popitem()
+        client.close()
+
+    close_credential()
+
+
+def validate_local_files() -> Tuple[int, int]:
+    """
+    Check the agent instructions and OpenAPI spec without contacting Azure.
+
+    Returns:
+        Tuple of (instruction length in characters, number of API paths)
+
+    Raises:
+        FileNotFoundError: If either file is missing
+        ValueError: If the instructions are empty or the spec is incomplete
+    """
+    instructions = _read_text_cached(*_file_key(_PROMPTS_FILE))
+    if not instructions.strip():
+        raise ValueError(f"Agent prompts file is empty: {_PROMPTS_FILE}")
+
+    openapi_spec = _load_json_cached(*_file_key(_OPENAPI_FILE))
+    missing = [key for key in ("openapi", "info", "paths") if key not in openapi_spec]
+    if missing:
+        raise ValueError(f"OpenAPI spec {_OPENAPI_FILE} is missing: {', '.join(missing)}")
+
+    return len(instructions), len(openapi_spec["paths"])
+
+
 class FoundryAgentRegistration:
     """Handles registration of agent with Azure AI Foundry."""
 
     def __init__(self):
         """Initialize Foundry agent registration."""
-        self.project_endpoint = os.getenv("AZURE_AI_PROJECT_ENDPOINT")
-        self.weather_api_url = os.getenv("WEATHER_API_URL")
-
-        if not self.project_endpoint:
-            raise ValueError("AZURE_AI_PROJECT_ENDPOINT environment variable is required")
-        if not self.weather_api_url:
-            raise ValueError("WEATHER_API_URL environment variable is required (external weather API endpoint)")
-
-        # Initialize Azure AI Project Client
-        credential = DefaultAzureCredential()
-        self.client = AIProjectClient(
-            endpoint=self.project_endpoint,
-            credential=credential
-        )
+        env = _env()
+        self.project_endpoint = env.project_endpoint
+        self.weather_api_url = env.weather_api_url
+        self.model_deployment = env.model_deployment
 
-        logger.info(f"Initialized Foundry client for project: {self.project_endpoint}")
+        logger.info(f"Initialized Foundry registration for project: {self.project_endpoint}")
         logger.info(f"Weather API endpoint: {self.weather_api_url}")
 
+    @property
+    def client(self) -> "AIProjectClient":
+        """Azure AI Project client, created on first use and shared per endpoint."""
+        return _get_client(self.project_endpoint)
+
     def load_agent_instructions(self) -> str:
         """
         Load agent instructions from contracts/agent-prompts.md.
@@ -72,42 +243,45 @@ class FoundryAgentRegistration:
         Returns:
             Agent instruction text
         """
-        prompts_file = PROJECT_ROOT / 'specs' / '001-weather-clothing-advisor' / 'contracts' / 'agent-prompts.md'
-
         try:
-            with open(prompts_file, 'r', encoding='utf-8') as f:
-                instructions = f.read()
-            logger.info(f"Loaded agent instructions from {prompts_file}")
+            instructions = _read_text_cached(*_file_key(_PROMPTS_FILE))
+            logger.info(f"Loaded agent instructions from {_PROMPTS_FILE}")
             return instructions
         except FileNotFoundError:
-            logger.error(f"Agent prompts file not found: {prompts_file}")
+            logger.error(f"Agent prompts file not found: {_PROMPTS_FILE}")
             raise
 
     def load_openapi_spec(self) -> Dict[str, Any]:
         """
         Load OpenAPI 3.0 specification for weather API.
 
+        The parsed spec is cached until the file changes and shared
+        between calls, so callers must not mutate it.
+
         Returns:
             OpenAPI spec dictionary
         """
-        openapi_file = PROJECT_ROOT / 'src' / 'weather-api' / 'openapi.json'
-
         try:
-            with open(openapi_file, 'r', encoding='utf-8') as f:
-                openapi_spec = json.load(f)
-            logger.info(f"Loaded OpenAPI spec from {openapi_file}")
+            openapi_spec = _load_json_cached(*_file_key(_OPENAPI_FILE))
+            logger.info(f"Loaded OpenAPI spec from {_OPENAPI_FILE}")
             return openapi_spec
         except FileNotFoundError:
-            logger.error(f"OpenAPI spec file not found: {openapi_file}")
+            logger.error(f"OpenAPI spec file not found: {_OPENAPI_FILE}")
             raise
 
-    def get_tool_definition(self) -> OpenApiAgentTool:
+    def get_tool_definition(self) -> "OpenApiAgentTool":
         """
         Get the OpenAPI tool definition for Foundry.
 
         Returns:
             OpenApiAgentTool instance
         """
+        from azure.ai.projects.models import (
+            OpenApiAgentTool,
+            OpenApiAnonymousAuthDetails,
+            OpenApiFunctionDefinition,
+        )
+
         try:
             openapi_spec = self.load_openapi_spec()
 
@@ -128,6 +302,34 @@ class FoundryAgentRegistration:
             logger.exception("Error creating tool definition")
             raise
 
+    def build_definition(self) -> "PromptAgentDefinition":
+        """
+        Build the agent definition shared by register and update.
+
+        Every update creates a new agent version from the full definition,
+        so instructions and tools are always both included.
+
+        Returns:
+            PromptAgentDefinition with model, instructions and tools set
+        """
+        from azure.ai.projects.models import PromptAgentDefinition
+
+        if not self.model_deployment:
+            raise ValueError("AZURE_AI_MODEL_DEPLOYMENT_NAME environment variable is required")
+
+        # Load both files concurrently so the reads overlap
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            instructions_future = executor.submit(self.load_agent_instructions)
+            tool_future = executor.submit(self.get_tool_definition)
+            agent_instructions = instructions_future.result()
+            agent_tools = [tool_future.result()]
+
+        return PromptAgentDefinition(
+            model=self.model_deployment,
+            instructions=agent_instructions,
+            tools=agent_tools,
+        )
+
     def register_agent(self, agent_name: str = "WeatherClothingAdvisor") -> str:
         """
         Register agent with Azure AI Foundry.
@@ -141,32 +343,14 @@ class FoundryAgentRegistration:
         logger.info(f"Registering agent: {agent_name}")
 
         try:
-            # Load instructions and tool
-            instructions = self.load_agent_instructions()
-            tool = self.get_tool_definition()
-
-            # Get model deployment name
-            model_deployment = os.getenv("AZURE_AI_MODEL_DEPLOYMENT_NAME")
-            if not model_deployment:
-                raise ValueError("AZURE_AI_MODEL_DEPLOYMENT_NAME environment variable is required")
-
-            # Create agent definition using SDK models
-            definition = PromptAgentDefinition(
-                model=model_deployment,
-                instructions=instructions,
-                tools=[tool],
-            )
+            definition = self.build_definition()
 
             # Register agent with Foundry using new SDK API
             agent = self.client.agents.create(
                 name=agent_name,
                 definition=definition,
                 description="Weather-based clothing advisor using OpenAPI weather tool",
-                metadata={
-                    "deployment_type": "foundry-agent",
-                    "version": "1.0.0",
-                    "feature": "001-weather-clothing-advisor"
-                }
+                metadata={**_AGENT_METADATA, "config_hash": _fingerprint(definition)},
             )
 
             agent_id = agent.id
@@ -178,37 +362,41 @@ class FoundryAgentRegistration:
             logger.exception(f"Error registering agent: {agent_name}")
             raise
 
-    def update_agent(self, agent_name: str) -> None:
+    def update_agent(self, agent_name: str, *, force: bool = False) -> bool:
         """
-        Update an existing agent's instructions or tools.
+        Update an existing agent's instructions and tools.
+
+        The update is skipped when the agent's stored ``config_hash``
+        already matches the new definition.
 
         Args:
             agent_name: Name of the agent to update
+            force: Update even if the configuration is unchanged
+
+        Returns:
+            True if an update was sent, False if it was skipped
         """
         logger.info(f"Updating agent: {agent_name}")
 
         try:
-            instructions = self.load_agent_instructions()
-            tool = self.get_tool_definition()
-
-            # Get model deployment name
-            model_deployment = os.getenv("AZURE_AI_MODEL_DEPLOYMENT_NAME")
-            if not model_deployment:
-                raise ValueError("AZURE_AI_MODEL_DEPLOYMENT_NAME environment variable is required")
-
-            # Create updated definition
-            definition = PromptAgentDefinition(
-                model=model_deployment,
-                instructions=instructions,
-                tools=[tool],
-            )
+            definition = self.build_definition()
+            config_hash = _fingerprint(definition)
+
+            if not force:
+                existing = self.client.agents.get(agent_name=agent_name)
+                metadata = existing.versions.latest.metadata or {}
+                if metadata.get("config_hash") == config_hash:
+                    logger.info(f"No changes for agent {agent_name}, skipping update")
+                    return False
 
             self.client.agents.update(
                 agent_name=agent_name,
                 definition=definition,
+                metadata={**_AGENT_METADATA, "config_hash": config_hash},
             )
 
             logger.info(f"Successfully updated agent: {agent_name}")
+            return True
 
         except Exception as e:
             logger.exception(f"Error updating agent: {agent_name}")
@@ -230,18 +418,24 @@ class FoundryAgentRegistration:
             logger.exception(f"Error deleting agent: {agent_name}")
             raise
 
-    def list_agents(self) -> list:
+    def list_agents(self, deployment_type: Optional[str] = None) -> Iterator[Any]:
         """
-        List all registered agents.
+        Iterate registered agents, fetching pages as they are consumed.
 
-        Returns:
-            List of agent objects
+        Args:
+            deployment_type: Only yield agents whose latest version's
+                ``deployment_type`` metadata matches (all agents when None)
+
+        Yields:
+            Agent objects
         """
         try:
-            agents_paged = self.client.agents.list()
-            agents = list(agents_paged)  # Convert ItemPaged to list
-            logger.info(f"Found {len(agents)} registered agents")
-            return agents
+            for agent in self.client.agents.list():
+                if deployment_type is not None:
+                    metadata = agent.versions.latest.metadata or {}
+                    if metadata.get("deployment_type") != deployment_type:
+                        continue
+                yield agent
         except Exception as e:
             logger.exception("Error listing agents")
             raise
@@ -252,14 +446,26 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="Register Weather Clothing Advisor agent with Azure AI Foundry")
-    parser.add_argument("action", choices=["register", "update", "delete", "list"],
+    parser.add_argument("action", choices=["register", "update", "delete", "list", "validate"],
                        help="Action to perform")
     parser.add_argument("--agent-name", default="WeatherClothingAdvisor",
                        help="Agent name (for register/update/delete actions)")
+    parser.add_argument("--force", action="store_true",
+                       help="Update even if the agent configuration is unchanged (for update action)")
+    parser.add_argument("--deployment-type",
+                       help="Only list agents with this deployment_type metadata (for list action)")
 
     args = parser.parse_args()
 
     try:
+        if args.action == "validate":
+            # Local files only: no environment, SDK or client needed
+            instructions_length, path_count = validate_local_files()
+            print(f"✓ Configuration valid")
+            print(f"  Instructions: {instructions_length} characters")
+            print(f"  OpenAPI paths: {path_count}")
+            return
+
         registration = FoundryAgentRegistration()
 
         if args.action == "register":
@@ -269,22 +475,28 @@ def main():
             print(f"  Agent Name: {args.agent_name}")
 
         elif args.action == "update":
-            registration.update_agent(args.agent_name)
-            print(f"✓ Agent updated successfully: {args.agent_name}")
+            if registration.update_agent(args.agent_name, force=args.force):
+                print(f"✓ Agent updated successfully: {args.agent_name}")
+            else:
+                print(f"✓ Agent already up to date: {args.agent_name}")
 
         elif args.action == "delete":
             registration.delete_agent(args.agent_name)
             print(f"✓ Agent deleted successfully: {args.agent_name}")
 
         elif args.action == "list":
-            agents = registration.list_agents()
-            print(f"\nRegistered Agents ({len(agents)}):")
-            for agent in agents:
+            print("\nRegistered Agents:")
+            count = 0
+            for agent in registration.list_agents(args.deployment_type):
                 print(f"  - {agent.name} (ID: {agent.id})")
+                count += 1
+            print(f"Found {count} registered agents")
 
     except Exception as e:
         print(f"✗ Error: {str(e)}")
         sys.exit(1)
+    finally:
+        close_clients()
 
 
 if __name__ == "__main__":
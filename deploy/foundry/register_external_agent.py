@@ -16,7 +16,18 @@ import os
 import sys
 import json
 import logging
-from typing import Dict, Any
+from functools import lru_cache
+from pathlib import Path
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, Any, Iterator
+
+from _credential import get_credential
+
+try:
+    import orjson
+except ImportError:
+    # Fall back to stdlib json when orjson is not installed
+    orjson = None
 
 try:
     from dotenv import load_dotenv
@@ -24,14 +35,8 @@ except ImportError:
     def load_dotenv():
         pass  # No-op if dotenv not installed
 
-from azure.ai.projects import AIProjectClient
-from azure.ai.projects.models import (
-    PromptAgentDefinition,
-    OpenApiAgentTool,
-    OpenApiFunctionDefinition,
-    OpenApiAnonymousAuthDetails,
-)
-from azure.identity import DefaultAzureCredential
+if TYPE_CHECKING:
+    from azure.ai.projects.models import OpenApiAgentTool
 
 # Configure logging
 logging.basicConfig(
@@ -40,6 +45,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# OpenAPI spec describing the external agent's /responses endpoint
+_SPEC_FILE = Path(__file__).resolve().parent / 'external-agent-openapi.json'
+
+# Instructions for the meta-agent that forwards requests to the external agent
+META_AGENT_INSTRUCTIONS = """You are a meta-agent that can invoke an externally hosted Weather Clothing Advisor agent.
+
+When a user asks for clothing recommendations or weather information, you should:
+1. Use the chatWithExternalAgent tool to forward the request to the external agent
+2. Return the response from the external agent to the user
+3. If the external agent returns an error, explain the issue to the user
+
+The external agent is running in Azure Container Apps and provides weather-based clothing recommendations for US zip codes.
+
+Always use the external agent for weather and clothing questions - do not try to answer them yourself.
+"""
+
+
+@lru_cache(maxsize=4)
+def _load_spec_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a JSON spec file; cached per (path, mtime). Treat as read-only."""
+    data = Path(path).read_bytes()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 
 class ExternalAgentRegistration:
     """Register external Container Apps agent with Azure AI Foundry."""
@@ -56,10 +84,18 @@ class ExternalAgentRegistration:
         if not self.external_agent_url:
             raise ValueError("EXTERNAL_AGENT_URL environment variable is required")
 
-        credential = DefaultAzureCredential()
+        # Imported here so --help and argument errors skip the SDK import
+        try:
+            from azure.ai.projects import AIProjectClient
+        except ImportError:
+            raise ImportError(
+                "Azure AI Foundry SDK not installed. "
+                "Install with: pip install azure-ai-projects azure-identity"
+            )
+
         self.client = AIProjectClient(
             endpoint=self.project_endpoint,
-            credential=credential
+            credential=get_credential()
         )
 
         logger.info(f"Initialized Foundry client for project: {self.project_endpoint}")
@@ -72,23 +108,22 @@ class ExternalAgentRegistration:
         Returns:
             OpenAPI spec dictionary
         """
-        openapi_file = os.path.join(
-            os.path.dirname(__file__),
-            'external-agent-openapi.json'
-        )
-
         try:
-            with open(openapi_file, 'r', encoding='utf-8') as f:
-                openapi_spec = json.load(f)
-
-            # Update server URL with environment variable
-            if openapi_spec.get('servers'):
-                openapi_spec['servers'][0]['url'] = self.external_agent_url
+            openapi_spec = _load_spec_cached(str(_SPEC_FILE), _SPEC_FILE.stat().st_mtime_ns)
+
+            # Point the first server at the external agent without mutating
+            # the cached spec
+            servers = openapi_spec.get('servers')
+            if servers:
+                openapi_spec = {
+                    **openapi_spec,
+                    'servers': [{**servers[0], 'url': self.external_agent_url}, *servers[1:]],
+                }
 
-            logger.info(f"Loaded external agent OpenAPI spec from {openapi_file}")
+            logger.info(f"Loaded external agent OpenAPI spec from {_SPEC_FILE}")
             return openapi_spec
         except FileNotFoundError:
-            logger.error(f"OpenAPI spec file not found: {openapi_file}")
+            logger.error(f"OpenAPI spec file not found: {_SPEC_FILE}")
             raise
 
     def load_meta_agent_instructions(self) -> str:
@@ -98,26 +133,21 @@ class ExternalAgentRegistration:
         Returns:
             Agent instructions string
         """
-        instructions = """You are a meta-agent that can invoke an externally hosted Weather Clothing Advisor agent.
-
-When a user asks for clothing recommendations or weather information, you should:
-1. Use the chatWithExternalAgent tool to forward the request to the external agent
-2. Return the response from the external agent to the user
-3. If the external agent returns an error, explain the issue to the user
-
-The external agent is running in Azure Container Apps and provides weather-based clothing recommendations for US zip codes.
+        return META_AGENT_INSTRUCTIONS
 
-Always use the external agent for weather and clothing questions - do not try to answer them yourself.
-"""
-        return instructions
-
-    def get_external_agent_tool(self) -> OpenApiAgentTool:
+    def get_external_agent_tool(self) -> "OpenApiAgentTool":
         """
         Get the OpenAPI tool definition for external agent.
 
         Returns:
             OpenApiAgentTool instance
         """
+        from azure.ai.projects.models import (
+            OpenApiAgentTool,
+            OpenApiAnonymousAuthDetails,
+            OpenApiFunctionDefinition,
+        )
+
         try:
             openapi_spec = self.load_external_agent_spec()
 
@@ -148,6 +178,8 @@ Always use the external agent for weather and clothing questions - do not try to
         Returns:
             Agent ID from Foundry
         """
+        from azure.ai.projects.models import PromptAgentDefinition
+
         logger.info(f"Registering meta-agent: {agent_name}")
 
         try:
@@ -189,18 +221,18 @@ Always use the external agent for weather and clothing questions - do not try to
             logger.exception(f"Error registering meta-agent: {agent_name}")
             raise
 
-    def list_agents(self) -> list:
+    def list_agents(self) -> Iterator[Any]:
         """
-        List all registered agents in Foundry.
+        Iterate registered agents in Foundry.
+
+        Pages are fetched as the iterator is consumed, so callers that stop
+        early avoid requesting the remaining pages.
 
         Returns:
-            List of agent objects
+            Iterator of agent objects
         """
         try:
-            agents_paged = self.client.agents.list()
-            agents = list(agents_paged)
-            logger.info(f"Found {len(agents)} registered agents")
-            return agents
+            return iter(self.client.agents.list())
         except Exception as e:
             logger.exception("Error listing agents")
             raise
@@ -223,6 +255,17 @@ def main():
         default="ExternalAgentInvoker",
         help="Name for the meta-agent (for register action)"
     )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=100,
+        help="Maximum number of agents to list (for list action)"
+    )
+    parser.add_argument(
+        "--count",
+        action="store_true",
+        help="Also report the total number of agents (fetches every page)"
+    )
 
     args = parser.parse_args()
 
@@ -238,10 +281,15 @@ def main():
             print(f"\nThis meta-agent can now invoke the external Container Apps agent!")
 
         elif args.action == "list":
-            agents = registration.list_agents()
-            print(f"\nRegistered Agents ({len(agents)}):")
-            for agent in agents:
-                print(f"  - {agent.name} (ID: {agent.id})")
+            agent_iter = registration.list_agents()
+            agents = list(islice(agent_iter, args.limit))
+            lines = [f"\nRegistered Agents (showing {len(agents)}):"]
+            lines.extend(f"  - {agent.name} (ID: {agent.id})" for agent in agents)
+            if args.count:
+                # Keep consuming the same listing so no page is fetched twice
+                total = len(agents) + sum(1 for _ in agent_iter)
+                lines.append(f"Total registered agents: {total}")
+            sys.stdout.write("\n".join(lines) + "\n")
 
     except Exception as e:
         print(f"✗ Error: {str(e)}")
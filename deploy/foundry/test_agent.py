@@ -6,14 +6,16 @@ Tests the WeatherClothingAdvisor agent via API calls.
 Updated for azure-ai-projects SDK v2.0.0+ (GA API with conversations).
 """
 
+import asyncio
 import os
 import sys
 import time
 import logging
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
 from dotenv import load_dotenv
-from azure.ai.projects import AIProjectClient
-from azure.identity import DefaultAzureCredential
+
+from _credential import get_credential
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +24,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Separator lines for console output
+_BANNER = "=" * 80
+_DIVIDER = "-" * 80
+
 
 class FoundryAgentTester:
     """Test Azure AI Foundry agent via API."""
@@ -34,14 +40,37 @@ class FoundryAgentTester:
         if not self.project_endpoint:
             raise ValueError("AZURE_AI_PROJECT_ENDPOINT environment variable is required")
 
-        credential = DefaultAzureCredential()
+        # Imported here so --help and argument errors skip the SDK import
+        try:
+            from azure.ai.projects import AIProjectClient
+        except ImportError:
+            raise ImportError(
+                "Azure AI Foundry SDK not installed. "
+                "Install with: pip install azure-ai-projects azure-identity"
+            )
+
         self.client = AIProjectClient(
             endpoint=self.project_endpoint,
-            credential=credential
+            credential=get_credential()
         )
 
+        # Conversation cleanup runs here, off the test's critical path
+        self._cleanup_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cleanup")
+
         logger.info(f"Initialized Foundry client for project: {self.project_endpoint}")
 
+    def close(self) -> None:
+        """Wait for pending conversation cleanup to finish."""
+        self._cleanup_pool.shutdown(wait=True)
+
+    @staticmethod
+    def _delete_conversation(openai_client: Any, conversation_id: str) -> None:
+        """Delete a test conversation, logging rather than raising on failure."""
+        try:
+            openai_client.conversations.delete(conversation_id=conversation_id)
+        except Exception as cleanup_error:
+            logger.warning(f"Failed to cleanup conversation: {cleanup_error}")
+
     def test_agent(self, agent_name: str, test_message: str = "What should I wear in 10001?") -> Dict[str, Any]:
         """
         Test agent with a message using the new conversations API.
@@ -89,12 +118,9 @@ class FoundryAgentTester:
             end_time = time.time()
             duration = end_time - start_time
 
-            # Clean up conversation
+            # Clean up conversation in the background
             logger.info("Cleaning up conversation...")
-            try:
-                openai_client.conversations.delete(conversation_id=conversation_id)
-            except Exception as cleanup_error:
-                logger.warning(f"Failed to cleanup conversation: {cleanup_error}")
+            self._cleanup_pool.submit(self._delete_conversation, openai_client, conversation_id)
 
             result = {
                 "success": True,
@@ -115,11 +141,7 @@ class FoundryAgentTester:
 
             # Try to clean up conversation on error
             if conversation_id:
-                try:
-                    openai_client = self.client.get_openai_client()
-                    openai_client.conversations.delete(conversation_id=conversation_id)
-                except Exception:
-                    pass
+                self._cleanup_pool.submit(self._delete_conversation, openai_client, conversation_id)
 
             logger.exception("Test failed")
             return {
@@ -131,53 +153,114 @@ class FoundryAgentTester:
                 "status": "failed"
             }
 
+    async def test_agent_async(self, agent_name: str, test_message: str = "What should I wear in 10001?") -> Dict[str, Any]:
+        """
+        Test agent without blocking the event loop.
+
+        Runs test_agent in a worker thread so several agents can be tested
+        concurrently with the shared sync client.
+
+        Args:
+            agent_name: Name of the agent to test
+            test_message: Message to send to the agent
+
+        Returns:
+            Test results dictionary
+        """
+        return await asyncio.to_thread(self.test_agent, agent_name, test_message)
+
+    async def test_agents_batch(self, agent_names: List[str], test_message: str = "What should I wear in 10001?") -> List[Dict[str, Any]]:
+        """
+        Test several agents concurrently with the same message.
+
+        Args:
+            agent_names: Names of the agents to test
+            test_message: Message to send to each agent
+
+        Returns:
+            Test results in the same order as agent_names
+        """
+        return await asyncio.gather(
+            *(self.test_agent_async(name, test_message) for name in agent_names)
+        )
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    """
+    Print a single agent test result with success criteria.
+
+    Args:
+        result: Test results dictionary from test_agent
+    """
+    # Build the report first so it is written in a single call
+    lines = [
+        "\n" + _BANNER,
+        "FOUNDRY AGENT TEST RESULTS",
+        _BANNER,
+        f"Agent Name: {result['agent_name']}",
+        f"Test Message: {result['test_message']}",
+        f"Duration: {result['duration_seconds']}s",
+        f"Status: {result['status']}",
+        _DIVIDER,
+    ]
+
+    if result['success']:
+        response = result['response']
+        fast_enough = result['duration_seconds'] < 10
+        has_clothing = 'wear' in response.lower() or 'clothing' in response.lower()
+        lines += [
+            "\n✓ TEST PASSED\n",
+            "Agent Response:",
+            _DIVIDER,
+            response,
+            _DIVIDER,
+            # Check success criteria
+            "\nSuccess Criteria:",
+            "  ✓ Response received",
+            f"  {'✓' if fast_enough else '✗'} Response time < 10s (SC-001): {result['duration_seconds']}s",
+            f"  {'✓' if has_clothing else '✗'} Clothing recommendation format (SC-002)",
+        ]
+    else:
+        lines += [
+            "\n✗ TEST FAILED\n",
+            f"Error: {result['error']}",
+        ]
+
+    print("\n".join(lines))
+
 
 def main():
     """Main entry point for agent testing."""
     import argparse
 
     parser = argparse.ArgumentParser(description="Test Weather Clothing Advisor agent in Azure AI Foundry")
-    parser.add_argument("agent_name", help="Agent name to test (e.g., WeatherClothingAdvisor)")
+    parser.add_argument("agent_names", nargs="+", metavar="agent_name",
+                       help="Agent name(s) to test (e.g., WeatherClothingAdvisor); several are tested concurrently")
     parser.add_argument("--message", default="What should I wear in 10001?",
                        help="Test message to send to agent")
 
     args = parser.parse_args()
 
+    tester = None
     try:
         tester = FoundryAgentTester()
-        result = tester.test_agent(args.agent_name, args.message)
-
-        print("\n" + "="*80)
-        print("FOUNDRY AGENT TEST RESULTS")
-        print("="*80)
-        print(f"Agent Name: {result['agent_name']}")
-        print(f"Test Message: {result['test_message']}")
-        print(f"Duration: {result['duration_seconds']}s")
-        print(f"Status: {result['status']}")
-        print("-"*80)
-
-        if result['success']:
-            print("\n✓ TEST PASSED\n")
-            print("Agent Response:")
-            print("-"*80)
-            print(result['response'])
-            print("-"*80)
+        if len(args.agent_names) == 1:
+            results = [tester.test_agent(args.agent_names[0], args.message)]
+        else:
+            results = asyncio.run(tester.test_agents_batch(args.agent_names, args.message))
 
-            # Check success criteria
-            print("\nSuccess Criteria:")
-            print(f"  ✓ Response received")
-            print(f"  {'✓' if result['duration_seconds'] < 10 else '✗'} Response time < 10s (SC-001): {result['duration_seconds']}s")
-            print(f"  {'✓' if 'wear' in result['response'].lower() or 'clothing' in result['response'].lower() else '✗'} Clothing recommendation format (SC-002)")
+        for result in results:
+            print_result(result)
 
-            sys.exit(0)
-        else:
-            print("\n✗ TEST FAILED\n")
-            print(f"Error: {result['error']}")
-            sys.exit(1)
+        sys.exit(0 if all(result['success'] for result in results) else 1)
 
     except Exception as e:
         print(f"\n✗ Error: {str(e)}")
         sys.exit(1)
+    finally:
+        # Wait for background conversation cleanup on every exit path
+        if tester is not None:
+            tester.close()
 
 
 if __name__ == "__main__":
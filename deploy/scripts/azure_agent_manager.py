@@ -41,6 +41,10 @@ logger = logging.getLogger(__name__)
 # API Version for Foundry Hosted Agents
 API_VERSION = "2025-05-15-preview"
 
+# Separator lines for console output
+_BANNER = "=" * 60
+_DIVIDER = "-" * 60
+
 
 @dataclass
 class AgentConfig:
@@ -332,9 +336,9 @@ def create_agent_from_env() -> Dict[str, Any]:
 
 def interactive_create() -> None:
     """Interactive mode to create an agent with prompts."""
-    print("\n" + "=" * 60)
+    print("\n" + _BANNER)
     print("Azure AI Agent Manager - Interactive Mode")
-    print("=" * 60)
+    print(_BANNER)
 
     # Get endpoint
     default_endpoint = os.environ.get("AZURE_AI_PROJECT_ENDPOINT", "")
@@ -359,14 +363,14 @@ def interactive_create() -> None:
     memory = input("Memory allocation [2Gi]: ").strip() or "2Gi"
     protocol_version = input("Protocol version [v6]: ").strip() or "v6"
 
-    print("\n" + "-" * 60)
+    print("\n" + _DIVIDER)
     print("Configuration:")
     print(f"  Endpoint: {endpoint}")
     print(f"  Agent Name: {agent_name}")
     print(f"  Image: {agent_image}")
     print(f"  CPU: {cpu}, Memory: {memory}")
     print(f"  Protocol: {protocol_version}")
-    print("-" * 60)
+    print(_DIVIDER)
 
     confirm = input("\nCreate agent? [y/N]: ").strip().lower()
     if confirm != "y":
@@ -6,34 +6,166 @@ for agent lifecycle, tool registration, and message processing. Works identicall
 in Container Apps and Foundry Hosted deployments.
 """
 
+import asyncio
+import importlib.util
 import json
 import logging
 import os
+import re
+import threading
 import time
 import uuid
-from typing import Any, Dict, Optional
-
-try:
-    from agent_framework import ChatAgent
-    from agent_framework.azure import AzureOpenAIChatClient
-    from azure.identity import DefaultAzureCredential
-
-    AGENT_FRAMEWORK_AVAILABLE = True
-except ImportError:
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Annotated, Any, AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+# Check for the SDKs without importing them. agent_framework and
+# azure.identity dominate cold-start import time, so they are imported
+# in _initialize_agent only when an agent is actually created.
+AGENT_FRAMEWORK_AVAILABLE = (
+    importlib.util.find_spec("agent_framework") is not None
+    and importlib.util.find_spec("azure.identity") is not None
+)
+if not AGENT_FRAMEWORK_AVAILABLE:
     # Fallback for development without SDK installed
     logging.warning(
         "Microsoft Agent Framework SDK not installed. Using mock implementations."
     )
-    ChatAgent = None
-    AzureOpenAIChatClient = None
-    DefaultAzureCredential = None
-    AGENT_FRAMEWORK_AVAILABLE = False
 
-from agent.core.constants import SC_001_RESPONSE_TIME_SECONDS
+from agent.core.constants import (
+    ERROR_CODE_INVALID_ZIP,
+    ERROR_MSG_INVALID_ZIP,
+    SC_001_RESPONSE_TIME_SECONDS,
+)
 from agent.telemetry.telemetry import get_telemetry_service
 
 logger = logging.getLogger(__name__)
 
+_ZIP_RE = re.compile(r"[0-9]{5}")
+
+# How long a zip code rejected by the weather API is answered locally,
+# and how many rejected zip codes are remembered at most
+INVALID_ZIP_CACHE_TTL_SECONDS = 300
+INVALID_ZIP_CACHE_MAX_SIZE = 1024
+
+# Conversation sessions kept in memory (overridable via environment)
+DEFAULT_MAX_SESSIONS = 10000
+DEFAULT_SESSION_TTL_SECONDS = 3600
+
+# Token scope for Azure OpenAI / Foundry Models
+_COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+
+# Cached tokens are refreshed this long before they expire
+_TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+# AZURE_CREDENTIAL_TYPE values -> azure.identity credential class names
+# (managed_identity is handled separately to pass AZURE_CLIENT_ID)
+_CREDENTIAL_TYPES = {
+    "environment": "EnvironmentCredential",
+    "cli": "AzureCliCredential",
+}
+
+# scope -> AccessToken, shared by every agent in the process
+_token_cache: Dict[str, Any] = {}
+
+# Multiplex concurrent weather calls over one connection when h2 is installed
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Gateway errors from the weather API are retried with a short backoff
+_RETRY_STATUS_CODES = (502, 503, 504)
+_MAX_RETRIES = 3
+_RETRY_BACKOFF_SECONDS = 0.2
+
+# Weather API status codes that mean the zip code itself is invalid
+_INVALID_ZIP_STATUS_CODES = (400, 404)
+
+# Locations searched for agent-prompts.md
+_PROMPTS_RELATIVE_PATH = Path("specs", "001-weather-clothing-advisor", "contracts", "agent-prompts.md")
+_DOCKER_PROMPTS_FILE = Path("/app/contracts/agent-prompts.md")
+_PACKAGE_PROMPTS_FILE = Path(__file__).resolve().parents[3] / _PROMPTS_RELATIVE_PATH
+
+# Instructions used when agent-prompts.md cannot be found
+_FALLBACK_INSTRUCTIONS = """You are a weather-based clothing advisor assistant.
+
+When a user provides a zip code:
+1. Use the get_weather tool to retrieve current weather conditions
+2. Analyze the weather data (temperature, conditions, wind, precipitation)
+3. Provide 3-5 specific clothing recommendations based on the weather
+4. Organize recommendations by category (outerwear, layers, accessories, footwear)
+5. Explain why each item is recommended
+
+Be helpful, concise, and practical in your recommendations."""
+
+
+@lru_cache(maxsize=4)
+def _read_prompts_cached(path: str, mtime_ns: int) -> str:
+    """
+    Read a prompts file, memoized on its path and modification time.
+
+    Every AgentService construction loads the prompts; keying on mtime
+    means the file is only re-read after it has actually changed.
+
+    Args:
+        path: Path of the prompts file
+        mtime_ns: File modification time in nanoseconds (cache key only)
+
+    Returns:
+        File contents
+    """
+    return Path(path).read_text(encoding="utf-8")
+
+
+@lru_cache(maxsize=1)
+def _get_credential() -> Any:
+    """
+    Get the process-wide Azure credential, creating it on first use.
+
+    DefaultAzureCredential probes several auth sources the first time it
+    is used, so every agent in the process shares one instance. Set
+    AZURE_CREDENTIAL_TYPE (managed_identity, environment or cli) to use
+    that credential directly and skip the probing.
+
+    Returns:
+        Azure credential instance
+    """
+    import azure.identity
+
+    credential_type = os.getenv("AZURE_CREDENTIAL_TYPE", "").strip().lower()
+    if credential_type == "managed_identity":
+        # AZURE_CLIENT_ID selects a user-assigned identity when set
+        return azure.identity.ManagedIdentityCredential(
+            client_id=os.getenv("AZURE_CLIENT_ID")
+        )
+    if credential_type in _CREDENTIAL_TYPES:
+        return getattr(azure.identity, _CREDENTIAL_TYPES[credential_type])()
+    if credential_type:
+        logger.warning(
+            f"Unknown AZURE_CREDENTIAL_TYPE '{credential_type}', "
+            "using DefaultAzureCredential"
+        )
+    return azure.identity.DefaultAzureCredential()
+
+
+def _get_token(scope: str = _COGNITIVE_SERVICES_SCOPE) -> str:
+    """
+    Get a bearer token for a scope, reusing it until it is close to expiry.
+
+    Args:
+        scope: Token scope to request
+
+    Returns:
+        Access token string
+    """
+    token = _token_cache.get(scope)
+    if token is None or token.expires_on - time.time() <= _TOKEN_REFRESH_MARGIN_SECONDS:
+        token = _get_credential().get_token(scope)
+        _token_cache[scope] = token
+    return token.token
+
 
 class AgentService:
     """Service for managing the Weather-Based Clothing Advisor agent."""
@@ -55,8 +187,26 @@ class AgentService:
         # Load agent instructions from contracts
         self.instructions = self._load_agent_instructions()
 
-        # Initialize sessions storage
-        self.sessions: Dict[str, Any] = {}
+        # Session storage (session_id -> (last used, AgentThread)), least
+        # recently used first. Bounded so idle conversations are dropped.
+        self.sessions: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._sessions_lock = threading.Lock()
+
+        # Per-session locks so concurrent turns on one thread run in order
+        self._session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+        self.max_sessions = int(os.getenv("MAX_SESSIONS", DEFAULT_MAX_SESSIONS))
+        self.session_ttl = float(
+            os.getenv("SESSION_TTL", DEFAULT_SESSION_TTL_SECONDS)
+        )
+
+        # Zip codes the weather API rejected (zip_code -> expiry time),
+        # oldest first. Bounded so distinct bad zip codes cannot pile up.
+        self._invalid_zips: "OrderedDict[str, float]" = OrderedDict()
+
+        # Pooled async HTTP client for weather API calls, created on first use
+        self._http: Optional[httpx.AsyncClient] = None
 
         # Initialize telemetry
         self.telemetry = get_telemetry_service()
@@ -66,6 +216,22 @@ class AgentService:
 
         logger.info("Agent service initialized successfully")
 
+    @classmethod
+    async def create(cls, weather_api_url: Optional[str] = None) -> "AgentService":
+        """
+        Create an agent service without blocking the event loop.
+
+        Construction reads the agent prompts file and sets up credentials,
+        so it runs in a worker thread when called from async code.
+
+        Args:
+            weather_api_url: URL of the weather API service
+
+        Returns:
+            Initialized AgentService instance
+        """
+        return await asyncio.to_thread(cls, weather_api_url)
+
     def _load_agent_instructions(self) -> str:
         """
         Load agent instructions from contracts/agent-prompts.md.
@@ -73,58 +239,44 @@ class AgentService:
         Returns:
             Agent instruction text
         """
+        # An explicit path (set in the container image) is tried first, so
+        # deployed agents resolve the file with a single stat
+        env_path = os.getenv("AGENT_PROMPTS_PATH", "")
+
         # Try multiple possible locations
         possible_paths = [
+            # Environment variable path
+            env_path,
             # Docker container path (simplified)
-            "/app/contracts/agent-prompts.md",
+            _DOCKER_PROMPTS_FILE,
             # Running from project root
-            os.path.join(
-                os.getcwd(),
-                "specs",
-                "001-weather-clothing-advisor",
-                "contracts",
-                "agent-prompts.md",
-            ),
+            Path.cwd() / _PROMPTS_RELATIVE_PATH,
             # Running from src/agent directory
-            os.path.join(
-                os.path.dirname(__file__),
-                "..",
-                "..",
-                "..",
-                "specs",
-                "001-weather-clothing-advisor",
-                "contracts",
-                "agent-prompts.md",
-            ),
-            # Environment variable path
-            os.getenv("AGENT_PROMPTS_PATH", ""),
+            _PACKAGE_PROMPTS_FILE,
         ]
 
         for prompts_file in possible_paths:
-            if prompts_file and os.path.exists(prompts_file):
-                try:
-                    with open(prompts_file, "r", encoding="utf-8") as f:
-                        instructions = f.read()
-                    logger.info(f"Loaded agent instructions from {prompts_file}")
-                    return instructions
-                except Exception as e:
-                    logger.warning(f"Error reading {prompts_file}: {e}")
+            if not prompts_file:
+                continue
+            try:
+                mtime_ns = os.stat(prompts_file).st_mtime_ns
+            except OSError:
+                if prompts_file is env_path:
+                    logger.warning(f"AGENT_PROMPTS_PATH not found: {env_path}")
+                continue
+            try:
+                instructions = _read_prompts_cached(str(prompts_file), mtime_ns)
+                logger.info(f"Loaded agent instructions from {prompts_file}")
+                return instructions
+            except Exception as e:
+                logger.warning(f"Error reading {prompts_file}: {e}")
 
         logger.warning("Agent prompts file not found. Using fallback instructions.")
         return self._get_fallback_instructions()
 
     def _get_fallback_instructions(self) -> str:
         """Provide fallback instructions if file not found."""
-        return """You are a weather-based clothing advisor assistant.
-
-When a user provides a zip code:
-1. Use the get_weather tool to retrieve current weather conditions
-2. Analyze the weather data (temperature, conditions, wind, precipitation)
-3. Provide 3-5 specific clothing recommendations based on the weather
-4. Organize recommendations by category (outerwear, layers, accessories, footwear)
-5. Explain why each item is recommended
-
-Be helpful, concise, and practical in your recommendations."""
+        return _FALLBACK_INSTRUCTIONS
 
     def _initialize_agent(self) -> Optional[Any]:
         """
@@ -138,19 +290,19 @@ Be helpful, concise, and practical in your recommendations."""
             return None
 
         try:
-            # Define get_weather tool as a function
-            # Agent Framework uses Python functions with type annotations
-            from typing import Annotated
-
+            from agent_framework import ChatAgent
+            from agent_framework.azure import AzureOpenAIChatClient
             from pydantic import Field
 
-            def get_weather(
+            # Define get_weather tool as a function
+            # Agent Framework uses Python functions with type annotations
+            async def get_weather(
                 zip_code: Annotated[str, Field(description="5-digit US zip code")]
-            ) -> str:
+            ) -> Dict[str, Any]:
                 """Retrieve current weather data for a US zip code."""
-                result = self._call_weather_function(zip_code)
-                # Return JSON string for the agent to parse
-                return json.dumps(result)
+                # Agent Framework serializes structured results for the
+                # model, so the dict is returned without a JSON round-trip
+                return await self._call_weather_function(zip_code)
 
             # Store the tool function
             self._get_weather_tool = get_weather
@@ -171,19 +323,11 @@ Be helpful, concise, and practical in your recommendations."""
             logger.info(f"Using endpoint: {azure_endpoint}")
             logger.info(f"Using deployment: {deployment_name}")
 
-            # Create credential and token provider for Azure AD auth
-            credential = DefaultAzureCredential()
-
-            # Create token provider function for agent framework
-            def get_token() -> str:
-                token = credential.get_token("https://cognitiveservices.azure.com/.default")
-                return token.token
-
             # Create chat client with token provider
             chat_client = AzureOpenAIChatClient(
                 endpoint=azure_endpoint,
                 deployment_name=deployment_name,
-                ad_token_provider=get_token,
+                ad_token_provider=_get_token,
             )
 
             # Create agent with tools and instructions
@@ -203,7 +347,57 @@ Be helpful, concise, and practical in your recommendations."""
             logger.exception("Error initializing ChatAgent")
             raise
 
-    def _call_weather_function(self, zip_code: str) -> Dict[str, Any]:
+    def _get_http(self) -> httpx.AsyncClient:
+        """
+        Get the pooled weather API client, creating it on first use.
+
+        Connection failures are retried by the transport. Read timeouts are
+        not, so a slow weather API still fails within the SC-001 budget.
+
+        Returns:
+            httpx.AsyncClient with a keep-alive connection pool
+        """
+        if self._http is None:
+            transport = httpx.AsyncHTTPTransport(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=20),
+                retries=_MAX_RETRIES,
+            )
+            self._http = httpx.AsyncClient(
+                base_url=self.weather_api_url,
+                timeout=SC_001_RESPONSE_TIME_SECONDS,
+                transport=transport,
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the pooled weather API client, if one was created."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _get_weather_response(self, zip_code: str) -> httpx.Response:
+        """Request weather for a zip code, retrying gateway errors."""
+        client = self._get_http()
+        for attempt in range(_MAX_RETRIES + 1):
+            response = await client.get("/api/weather", params={"zip_code": zip_code})
+            if response.status_code not in _RETRY_STATUS_CODES or attempt == _MAX_RETRIES:
+                return response
+            await asyncio.sleep(_RETRY_BACKOFF_SECONDS * 2**attempt)
+        return response
+
+    @staticmethod
+    def _invalid_zip_error(zip_code: str) -> Dict[str, Any]:
+        """Build the error response for an invalid zip code."""
+        return {
+            "error": {
+                "error_code": ERROR_CODE_INVALID_ZIP,
+                "message": ERROR_MSG_INVALID_ZIP,
+                "details": f"'{zip_code}' is not a valid 5-digit US zip code",
+            }
+        }
+
+    async def _call_weather_function(self, zip_code: str) -> Dict[str, Any]:
         """
         Call the weather API container to get current conditions.
 
@@ -213,19 +407,32 @@ Be helpful, concise, and practical in your recommendations."""
         Returns:
             Weather data or error response
         """
-        import requests
+        # Reject malformed or recently rejected zip codes without a network call
+        if not _ZIP_RE.fullmatch(zip_code) or self._is_known_invalid_zip(zip_code):
+            logger.info(f"Rejected invalid zip code: {zip_code}")
+            return self._invalid_zip_error(zip_code)
 
         start_time = time.time()
 
         try:
             logger.info(f"Getting weather for zip code: {zip_code}")
 
-            # Call weather API container
-            response = requests.get(
-                f"{self.weather_api_url}/api/weather",
-                params={"zip_code": zip_code},
-                timeout=SC_001_RESPONSE_TIME_SECONDS,
-            )
+            # Call weather API container over the pooled keep-alive client
+            response = await self._get_weather_response(zip_code)
+
+            if response.status_code in _INVALID_ZIP_STATUS_CODES:
+                # Answer this and later requests for the zip code the same way
+                self._remember_invalid_zip(zip_code)
+                self.telemetry.track_dependency(
+                    name="get_weather",
+                    dependency_type="HTTP",
+                    target=self.weather_api_url,
+                    success=False,
+                    duration_ms=(time.time() - start_time) * 1000,
+                    properties={"zip_code": zip_code, "error": "invalid_zip"},
+                )
+                logger.info(f"Weather API rejected zip code: {zip_code}")
+                return self._invalid_zip_error(zip_code)
 
             response.raise_for_status()
             result = response.json()
@@ -247,7 +454,7 @@ Be helpful, concise, and practical in your recommendations."""
             )
             return result
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             duration_ms = (time.time() - start_time) * 1000
 
             self.telemetry.track_dependency(
@@ -288,6 +495,39 @@ Be helpful, concise, and practical in your recommendations."""
                 }
             }
 
+    def _remember_invalid_zip(self, zip_code: str) -> None:
+        """
+        Record a zip code the weather API rejected.
+
+        The oldest entry is evicted once ``INVALID_ZIP_CACHE_MAX_SIZE`` is
+        exceeded.
+
+        Args:
+            zip_code: 5-digit US zip code
+        """
+        self._invalid_zips[zip_code] = time.monotonic() + INVALID_ZIP_CACHE_TTL_SECONDS
+        self._invalid_zips.move_to_end(zip_code)
+        if len(self._invalid_zips) > INVALID_ZIP_CACHE_MAX_SIZE:
+            self._invalid_zips.popitem(last=False)
+
+    def _is_known_invalid_zip(self, zip_code: str) -> bool:
+        """
+        Check whether the weather API recently rejected a zip code.
+
+        Args:
+            zip_code: 5-digit US zip code
+
+        Returns:
+            True if the zip code was rejected within the cache TTL
+        """
+        expires_at = self._invalid_zips.get(zip_code)
+        if expires_at is None:
+            return False
+        if time.monotonic() >= expires_at:
+            del self._invalid_zips[zip_code]
+            return False
+        return True
+
     async def process_message(
         self, message: str, session_id: Optional[str] = None
     ) -> Dict[str, Any]:
@@ -314,28 +554,7 @@ Be helpful, concise, and practical in your recommendations."""
         )
 
         try:
-            if self.agent is None:
-                # Mock response for development
-                response_text = self._generate_mock_response(message)
-            else:
-                # Get or create session conversation history
-                conversation = self.sessions.get(session_id, [])
-
-                # Add user message
-                conversation.append({"role": "user", "content": message})
-
-                # Process with agent using Agent Framework's run method
-                # The run method returns an AgentRunResponse object
-                result = await self.agent.run(message)
-
-                # Extract text from the response object
-                response_text = result.text if hasattr(result, 'text') else str(result)
-
-                # Add assistant response to history
-                conversation.append({"role": "assistant", "content": response_text})
-
-                # Store updated conversation
-                self.sessions[session_id] = conversation
+            response_text = await self._run_agent(message, session_id)
 
             # Calculate response time
             response_time = time.time() - start_time
@@ -370,6 +589,122 @@ Be helpful, concise, and practical in your recommendations."""
 
             raise
 
+    async def process_message_stream(
+        self, message: str, session_id: str
+    ) -> AsyncIterator[str]:
+        """
+        Process a user message and stream the response text as it is generated.
+
+        Args:
+            message: User's message
+            session_id: Session ID for conversation continuity
+
+        Yields:
+            Response text chunks
+        """
+        if self.agent is None:
+            yield self._generate_mock_response(message)
+            return
+
+        # Track request
+        span = self.telemetry.track_request(
+            "process_message_stream", {"session_id": session_id}
+        )
+
+        try:
+            async with self._session_lock(session_id):
+                async for update in self.agent.run_stream(
+                    message, thread=self._get_thread(session_id)
+                ):
+                    if update.text:
+                        yield update.text
+
+        except Exception as e:
+            logger.exception(f"Error streaming message for session {session_id}")
+            self.telemetry.track_exception(e, {"session_id": session_id})
+            raise
+
+        finally:
+            if span:
+                span.end()
+
+    def _get_thread(self, session_id: str) -> Any:
+        """
+        Get or create the Agent Framework thread for a session.
+
+        The thread holds the conversation history, so it is passed to
+        ``agent.run`` instead of tracking messages separately. Sessions idle
+        longer than ``session_ttl`` start a new thread, and the least
+        recently used session is evicted once ``max_sessions`` is exceeded.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            AgentThread for the session
+        """
+        now = time.monotonic()
+        with self._sessions_lock:
+            # Entries are ordered by last use, so expired ones are at the front
+            while self.sessions:
+                oldest_id, (last_used, _) = next(iter(self.sessions.items()))
+                if now - last_used < self.session_ttl:
+                    break
+                del self.sessions[oldest_id]
+
+            entry = self.sessions.get(session_id)
+            thread = entry[1] if entry is not None else self.agent.get_new_thread()
+            self.sessions[session_id] = (now, thread)
+            self.sessions.move_to_end(session_id)
+            if len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+        return thread
+
+    def _session_lock(self, session_id: str) -> asyncio.Lock:
+        """
+        Get the lock that serializes agent turns for a session.
+
+        Every run on a session thread, streaming or not, holds this lock,
+        since each run updates the thread's conversation history.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            asyncio.Lock for the session
+        """
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = self._session_locks[session_id] = asyncio.Lock()
+        return lock
+
+    async def _run_agent(self, message: str, session_id: str, **options: Any) -> str:
+        """
+        Run the agent on the session thread and return the response text.
+
+        Turns for the same session are serialized by the session lock.
+
+        Args:
+            message: Prompt to send to the agent
+            session_id: Session ID
+            **options: Extra keyword arguments for ``agent.run``
+
+        Returns:
+            Response text string
+        """
+        if self.agent is None:
+            # Mock response for development
+            return self._generate_mock_response(message)
+
+        async with self._session_lock(session_id):
+            # The session thread carries the conversation history
+            result = await self.agent.run(
+                message, thread=self._get_thread(session_id), **options
+            )
+
+        # Extract text from the response object
+        return result.text if hasattr(result, "text") else str(result)
+
     def _generate_mock_response(self, message: str) -> str:
         """Generate mock response for development without SDK."""
         return f"Mock response to: {message}\n\nNote: Azure Agent Framework SDK not installed."
@@ -382,6 +717,41 @@ Be helpful, concise, and practical in your recommendations."""
             message: User's message
             session_id: Session ID
 
+        Returns:
+            Response text string
+        """
+        try:
+            return await self._run_agent(message, session_id)
+
+        except Exception as e:
+            logger.exception(f"Error in simple message processing: {e}")
+            self.telemetry.track_exception(e, {"session_id": session_id})
+            return "I encountered an error processing your request. Please try again."
+
+    def _weather_context_prompt(
+        self, message: str, weather_data: Dict[str, Any]
+    ) -> str:
+        """Build a prompt that supplies already-retrieved weather data."""
+        return (
+            f"{message}\n\n"
+            "Current weather data (already retrieved - do not call get_weather):\n"
+            f"{json.dumps(weather_data)}"
+        )
+
+    async def format_with_context(
+        self, message: str, weather_data: Dict[str, Any], session_id: str
+    ) -> str:
+        """
+        Generate recommendations from weather data the caller already fetched.
+
+        Used by the workflow orchestrator's final step. Tool calling is
+        disabled so the agent does not repeat the weather lookup.
+
+        Args:
+            message: User's message
+            weather_data: Weather data returned by get_weather
+            session_id: Session ID
+
         Returns:
             Response text string
         """
@@ -389,39 +759,55 @@ Be helpful, concise, and practical in your recommendations."""
             return self._generate_mock_response(message)
 
         try:
-            # Get or create session conversation history
-            conversation = self.sessions.get(session_id, [])
-
-            # Add user message
-            conversation.append({"role": "user", "content": message})
+            return await self._run_agent(
+                self._weather_context_prompt(message, weather_data),
+                session_id,
+                tool_choice="none",
+            )
 
-            # Process with agent - now properly async
-            agent_response = await self.agent.run(message)
+        except Exception as e:
+            logger.exception(f"Error formatting response with context: {e}")
+            self.telemetry.track_exception(e, {"session_id": session_id})
+            return "I encountered an error processing your request. Please try again."
 
-            # Extract text from AgentResponse object
-            response_text = (
-                agent_response.text
-                if hasattr(agent_response, "text")
-                else str(agent_response)
-            )
+    async def format_with_context_stream(
+        self, message: str, weather_data: Dict[str, Any], session_id: str
+    ) -> AsyncIterator[str]:
+        """
+        Stream recommendations from weather data the caller already fetched.
 
-            # Add assistant response to history
-            conversation.append({"role": "assistant", "content": response_text})
+        Args:
+            message: User's message
+            weather_data: Weather data returned by get_weather
+            session_id: Session ID
 
-            # Store updated conversation
-            self.sessions[session_id] = conversation
+        Yields:
+            Response text chunks
+        """
+        if self.agent is None:
+            yield self._generate_mock_response(message)
+            return
 
-            return response_text
+        try:
+            async with self._session_lock(session_id):
+                async for update in self.agent.run_stream(
+                    self._weather_context_prompt(message, weather_data),
+                    thread=self._get_thread(session_id),
+                    tool_choice="none",
+                ):
+                    if update.text:
+                        yield update.text
 
         except Exception as e:
-            logger.exception(f"Error in simple message processing: {e}")
+            logger.exception(f"Error streaming response with context: {e}")
             self.telemetry.track_exception(e, {"session_id": session_id})
-            return "I encountered an error processing your request. Please try again."
+            raise
 
     def reset_session(self, session_id: str) -> None:
         """Reset a conversation session."""
-        if session_id in self.sessions:
-            del self.sessions[session_id]
+        with self._sessions_lock:
+            removed = self.sessions.pop(session_id, None)
+        if removed is not None:
             logger.info(f"Session {session_id} reset")
         else:
             logger.warning(f"Session {session_id} not found")
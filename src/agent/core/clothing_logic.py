@@ -5,7 +5,9 @@ This module generates weather-appropriate clothing recommendations
 based on the rules defined in agent-prompts.md contract.
 """
 
-from typing import List
+from itertools import chain, islice, repeat
+from operator import attrgetter
+from typing import Dict, List, Tuple
 
 from agent.core.constants import (
     CATEGORY_ACCESSORIES,
@@ -29,6 +31,151 @@ from agent.core.models import (
 )
 
 
+# Base items for each temperature range, shared across recommendations.
+# The first item's reason is filled in with the current temperature.
+_TEMPERATURE_ITEMS: Dict[str, Tuple[ClothingItem, ...]] = {
+    "Winter": (
+        ClothingItem(
+            name="Heavy winter coat",
+            category=ClothingCategory.OUTERWEAR,
+            reason="Essential for {temperature:.0f}°F freezing temperatures",
+            priority=1,
+        ),
+        ClothingItem(
+            name="Warm layers (thermal underwear or fleece)",
+            category=ClothingCategory.LAYERS,
+            reason="Provides insulation under your coat",
+            priority=1,
+        ),
+        ClothingItem(
+            name="Winter hat and gloves",
+            category=ClothingCategory.ACCESSORIES,
+            reason="Protects extremities from cold",
+            priority=1,
+        ),
+        ClothingItem(
+            name="Insulated boots",
+            category=ClothingCategory.FOOTWEAR,
+            reason="Keeps feet warm and dry",
+            priority=2,
+        ),
+    ),
+    "Cool": (
+        ClothingItem(
+            name="Medium-weight jacket",
+            category=ClothingCategory.OUTERWEAR,
+            reason="Appropriate for {temperature:.0f}°F cool weather",
+            priority=1,
+        ),
+        ClothingItem(
+            name="Long-sleeve shirt or sweater",
+            category=ClothingCategory.LAYERS,
+            reason="Provides comfortable warmth",
+            priority=1,
+        ),
+        ClothingItem(
+            name="Light scarf (optional)",
+            category=ClothingCategory.ACCESSORIES,
+            reason="Extra warmth for neck area",
+            priority=3,
+        ),
+    ),
+    "Moderate": (
+        ClothingItem(
+            name="Light jacket or cardigan",
+            category=ClothingCategory.OUTERWEAR,
+            reason="Perfect for {temperature:.0f}°F mild temperatures",
+            priority=2,
+        ),
+        ClothingItem(
+            name="Long-sleeve shirt or light layers",
+            category=ClothingCategory.LAYERS,
+            reason="Versatile for changing conditions",
+            priority=1,
+        ),
+    ),
+    "Warm": (
+        ClothingItem(
+            name="Short-sleeve shirt or light top",
+            category=ClothingCategory.LAYERS,
+            reason="Comfortable for {temperature:.0f}°F warm weather",
+            priority=1,
+        ),
+        ClothingItem(
+            name="Light pants or shorts",
+            category=ClothingCategory.LAYERS,
+            reason="Keeps you cool in warm temperatures",
+            priority=1,
+        ),
+        ClothingItem(
+            name="Sunglasses",
+            category=ClothingCategory.ACCESSORIES,
+            reason="Protection from sun",
+            priority=2,
+        ),
+    ),
+    "Hot": (
+        ClothingItem(
+            name="Lightweight, breathable clothing",
+            category=ClothingCategory.LAYERS,
+            reason="Essential for {temperature:.0f}°F hot weather",
+            priority=1,
+        ),
+        ClothingItem(
+            name="Shorts or light skirt",
+            category=ClothingCategory.LAYERS,
+            reason="Maximum airflow and comfort",
+            priority=1,
+        ),
+        ClothingItem(
+            name="Wide-brim hat or cap",
+            category=ClothingCategory.ACCESSORIES,
+            reason="Sun protection for face and neck",
+            priority=1,
+        ),
+        ClothingItem(
+            name="Sunglasses",
+            category=ClothingCategory.ACCESSORIES,
+            reason="Eye protection from sun",
+            priority=2,
+        ),
+    ),
+}
+
+# Generic items used to reach the SC-002 minimum, keyed by whether the
+# weather is cold: (footwear, filler added once footwear is covered)
+_PADDING_ITEMS: Dict[bool, Tuple[ClothingItem, ClothingItem]] = {
+    True: (
+        ClothingItem(
+            name="Comfortable closed-toe shoes",
+            category=ClothingCategory.FOOTWEAR,
+            reason="Appropriate footwear for cooler weather",
+            priority=3,
+        ),
+        ClothingItem(
+            name="Long pants",
+            category=ClothingCategory.LAYERS,
+            reason="Keeps legs warm in cooler weather",
+            priority=3,
+        ),
+    ),
+    False: (
+        ClothingItem(
+            name="Comfortable shoes",
+            category=ClothingCategory.FOOTWEAR,
+            reason="Appropriate footwear for the weather",
+            priority=3,
+        ),
+        ClothingItem(
+            name="Light hat or cap",
+            category=ClothingCategory.ACCESSORIES,
+            reason="Optional sun protection",
+            priority=3,
+        ),
+    ),
+}
+
+
 class ClothingAdvisor:
     """
     Generates clothing recommendations based on weather conditions.
@@ -103,135 +250,17 @@ class ClothingAdvisor:
         self, temp_category: str, weather: WeatherData
     ) -> List[ClothingItem]:
         """Get base clothing items for temperature range."""
-        items = []
-
-        if temp_category == "Winter":
-            items.extend(
-                [
-                    ClothingItem(
-                        name="Heavy winter coat",
-                        category=ClothingCategory.OUTERWEAR,
-                        reason=f"Essential for {weather.temperature:.0f}°F freezing temperatures",
-                        priority=1,
-                    ),
-                    ClothingItem(
-                        name="Warm layers (thermal underwear or fleece)",
-                        category=ClothingCategory.LAYERS,
-                        reason="Provides insulation under your coat",
-                        priority=1,
-                    ),
-                    ClothingItem(
-                        name="Winter hat and gloves",
-                        category=ClothingCategory.ACCESSORIES,
-                        reason="Protects extremities from cold",
-                        priority=1,
-                    ),
-                    ClothingItem(
-                        name="Insulated boots",
-                        category=ClothingCategory.FOOTWEAR,
-                        reason="Keeps feet warm and dry",
-                        priority=2,
-                    ),
-                ]
-            )
-
-        elif temp_category == "Cool":
-            items.extend(
-                [
-                    ClothingItem(
-                        name="Medium-weight jacket",
-                        category=ClothingCategory.OUTERWEAR,
-                        reason=f"Appropriate for {weather.temperature:.0f}°F cool weather",
-                        priority=1,
-                    ),
-                    ClothingItem(
-                        name="Long-sleeve shirt or sweater",
-                        category=ClothingCategory.LAYERS,
-                        reason="Provides comfortable warmth",
-                        priority=1,
-                    ),
-                    ClothingItem(
-                        name="Light scarf (optional)",
-                        category=ClothingCategory.ACCESSORIES,
-                        reason="Extra warmth for neck area",
-                        priority=3,
-                    ),
-                ]
-            )
-
-        elif temp_category == "Moderate":
-            items.extend(
-                [
-                    ClothingItem(
-                        name="Light jacket or cardigan",
-                        category=ClothingCategory.OUTERWEAR,
-                        reason=f"Perfect for {weather.temperature:.0f}°F mild temperatures",
-                        priority=2,
-                    ),
-                    ClothingItem(
-                        name="Long-sleeve shirt or light layers",
-                        category=ClothingCategory.LAYERS,
-                        reason="Versatile for changing conditions",
-                        priority=1,
-                    ),
-                ]
-            )
-
-        elif temp_category == "Warm":
-            items.extend(
-                [
-                    ClothingItem(
-                        name="Short-sleeve shirt or light top",
-                        category=ClothingCategory.LAYERS,
-                        reason=f"Comfortable for {weather.temperature:.0f}°F warm weather",
-                        priority=1,
-                    ),
-                    ClothingItem(
-                        name="Light pants or shorts",
-                        category=ClothingCategory.LAYERS,
-                        reason="Keeps you cool in warm temperatures",
-                        priority=1,
-                    ),
-                    ClothingItem(
-                        name="Sunglasses",
-                        category=ClothingCategory.ACCESSORIES,
-                        reason="Protection from sun",
-                        priority=2,
-                    ),
-                ]
-            )
-
-        else:  # Hot
-            items.extend(
-                [
-                    ClothingItem(
-                        name="Lightweight, breathable clothing",
-                        category=ClothingCategory.LAYERS,
-                        reason=f"Essential for {weather.temperature:.0f}°F hot weather",
-                        priority=1,
-                    ),
-                    ClothingItem(
-                        name="Shorts or light skirt",
-                        category=ClothingCategory.LAYERS,
-                        reason="Maximum airflow and comfort",
-                        priority=1,
-                    ),
-                    ClothingItem(
-                        name="Wide-brim hat or cap",
-                        category=ClothingCategory.ACCESSORIES,
-                        reason="Sun protection for face and neck",
-                        priority=1,
-                    ),
-                    ClothingItem(
-                        name="Sunglasses",
-                        category=ClothingCategory.ACCESSORIES,
-                        reason="Eye protection from sun",
-                        priority=2,
-                    ),
-                ]
-            )
-
-        return items
+        template = _TEMPERATURE_ITEMS.get(temp_category, _TEMPERATURE_ITEMS["Hot"])
+        first = template[0]
+        return [
+            ClothingItem(
+                name=first.name,
+                category=first.category,
+                reason=first.reason.format(temperature=weather.temperature),
+                priority=first.priority,
+            ),
+            *template[1:],
+        ]
 
     def _get_precipitation_items(
         self, precip_type: str, temp_category: str
@@ -334,13 +363,15 @@ class ClothingAdvisor:
         unique_items = []
 
         for item in items:
-            # Simple name-based dedup
-            if item.name.lower() not in seen_names:
-                seen_names.add(item.name.lower())
+            # Simple name-based dedup, lowercasing each name once
+            name = item.name.lower()
+            if name not in seen_names:
+                seen_names.add(name)
                 unique_items.append(item)
 
-        # Sort by priority (lower number = higher priority)
-        unique_items.sort(key=lambda x: x.priority)
+        # Sort by priority (lower number = higher priority). The sort is
+        # stable, so items of equal priority keep their insertion order.
+        unique_items.sort(key=attrgetter("priority"))
 
         return unique_items
 
@@ -352,47 +383,18 @@ class ClothingAdvisor:
         if len(items) > SC_002_MAX_RECOMMENDATIONS:
             items = items[:SC_002_MAX_RECOMMENDATIONS]
 
-        # If too few, add generic items
-        while len(items) < SC_002_MIN_RECOMMENDATIONS:
-            # Add sensible defaults based on temperature
-            if temp_category in ("Winter", "Cool"):
-                if not any(i.category == ClothingCategory.FOOTWEAR for i in items):
-                    items.append(
-                        ClothingItem(
-                            name="Comfortable closed-toe shoes",
-                            category=ClothingCategory.FOOTWEAR,
-                            reason="Appropriate footwear for cooler weather",
-                            priority=3,
-                        )
-                    )
-                else:
-                    items.append(
-                        ClothingItem(
-                            name="Long pants",
-                            category=ClothingCategory.LAYERS,
-                            reason="Keeps legs warm in cooler weather",
-                            priority=3,
-                        )
-                    )
-            else:
-                if not any(i.category == ClothingCategory.FOOTWEAR for i in items):
-                    items.append(
-                        ClothingItem(
-                            name="Comfortable shoes",
-                            category=ClothingCategory.FOOTWEAR,
-                            reason="Appropriate footwear for the weather",
-                            priority=3,
-                        )
-                    )
-                else:
-                    items.append(
-                        ClothingItem(
-                            name="Light hat or cap",
-                            category=ClothingCategory.ACCESSORIES,
-                            reason="Optional sun protection",
-                            priority=3,
-                        )
-                    )
+        # If too few, add generic items: footwear first if none is present,
+        # then the temperature-appropriate filler for the remaining slots
+        need = SC_002_MIN_RECOMMENDATIONS - len(items)
+        if need > 0:
+            # Categories already covered, as a mask of ClothingCategory bits
+            present = 0
+            for item in items:
+                present |= item.category.bit
+
+            footwear, filler = _PADDING_ITEMS[temp_category in ("Winter", "Cool")]
+            lead = () if present & ClothingCategory.FOOTWEAR.bit else (footwear,)
+            items.extend(islice(chain(lead, repeat(filler)), need))
 
         return items
 
@@ -5,6 +5,7 @@ Defines temperature ranges, clothing categories, and API configuration
 used across all components.
 """
 
+from bisect import bisect_right
 from typing import Dict, Tuple
 
 # Temperature Classification Ranges (in Fahrenheit)
@@ -77,6 +78,11 @@ TEMP_RANGES: Dict[str, Tuple[float, float]] = {
     TEMP_LABEL_HOT: TEMP_RANGE_HOT,
 }
 
+# Lower bounds of every range but the first, and the label for each range,
+# for bisecting a temperature into its classification
+_TEMP_BOUNDARIES: Tuple[float, ...] = tuple(low for low, _ in TEMP_RANGES.values())[1:]
+_TEMP_LABELS: Tuple[str, ...] = tuple(TEMP_RANGES)
+
 
 def classify_temperature(temp_fahrenheit: float) -> str:
     """
@@ -88,16 +94,7 @@ def classify_temperature(temp_fahrenheit: float) -> str:
     Returns:
         Temperature classification label (Winter, Cool, Moderate, Warm, Hot)
     """
-    if temp_fahrenheit < 32.0:
-        return TEMP_LABEL_FREEZING
-    elif temp_fahrenheit < 50.0:
-        return TEMP_LABEL_COOL
-    elif temp_fahrenheit < 70.0:
-        return TEMP_LABEL_MODERATE
-    elif temp_fahrenheit < 85.0:
-        return TEMP_LABEL_WARM
-    else:
-        return TEMP_LABEL_HOT
+    return _TEMP_LABELS[bisect_right(_TEMP_BOUNDARIES, temp_fahrenheit)]
 
 
 def requires_wind_protection(wind_speed_mph: float) -> bool:
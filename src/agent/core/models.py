@@ -11,15 +11,30 @@ from typing import Any, Dict, List, Optional
 
 
 class ClothingCategory(Enum):
-    """Categories of clothing items."""
+    """
+    Categories of clothing items.
+
+    Each category also carries a distinct ``bit`` so a set of categories
+    can be tracked as an integer mask.
+    """
 
-    OUTERWEAR = "outerwear"
-    LAYERS = "layers"
-    ACCESSORIES = "accessories"
-    FOOTWEAR = "footwear"
+    OUTERWEAR = ("outerwear", 1 << 0)
+    LAYERS = ("layers", 1 << 1)
+    ACCESSORIES = ("accessories", 1 << 2)
+    FOOTWEAR = ("footwear", 1 << 3)
 
+    def __new__(cls, value: str, bit: int) -> "ClothingCategory":
+        member = object.__new__(cls)
+        member._value_ = value
+        member.bit = bit
+        return member
 
-@dataclass
+
+# Serialized value of each category, avoiding Enum attribute lookups
+_CATEGORY_VALUE = {category: category.value for category in ClothingCategory}
+
+
+@dataclass(slots=True, frozen=True)
 class WeatherData:
     """
     Weather data retrieved from external weather API.
@@ -70,7 +85,7 @@ class WeatherData:
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ClothingItem:
     """
     A specific clothing item recommendation.
@@ -88,7 +103,7 @@ class ClothingItem:
         """Convert to dictionary for serialization."""
         return {
             "name": self.name,
-            "category": self.category.value,
+            "category": _CATEGORY_VALUE[self.category],
             "reason": self.reason,
             "priority": self.priority,
         }
@@ -6,12 +6,26 @@ telemetry tracking, and error handling. Works identically in Container Apps and
 Foundry Hosted deployments.
 """
 
+import asyncio
 import logging
 import re
+import secrets
+import threading
 import time
 import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
 from agent.core.constants import SC_001_RESPONSE_TIME_SECONDS
 from agent.telemetry.telemetry import get_telemetry_service
@@ -21,6 +35,122 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_ZIP_RE = re.compile(r"\b[0-9]{5}\b")
+_ASCII_DIGITS = frozenset("0123456789")
+
+
+def _find_zip_codes(message: str) -> List[str]:
+    """
+    Find all standalone 5-digit zip codes in a message.
+
+    Messages without any ASCII digit (e.g. "what should I wear in Chicago?")
+    cannot contain a zip code, so they skip the regex scan entirely.
+
+    Args:
+        message: User's message
+
+    Returns:
+        Zip codes in the order they appear
+    """
+    if _ASCII_DIGITS.isdisjoint(message):
+        return []
+    return _ZIP_RE.findall(message)
+
+
+# Fallback responses for failed workflows, matched against the step error
+_ERROR_MAP = (
+    (
+        re.compile(r"zip code", re.IGNORECASE),
+        "I couldn't find a valid zip code in your message. Please provide a 5-digit US zip code.",
+    ),
+    (
+        re.compile(r"timeout", re.IGNORECASE),
+        "The weather service is taking too long to respond. Please try again in a moment.",
+    ),
+    (
+        re.compile(r"network", re.IGNORECASE),
+        "I'm having trouble connecting to the weather service. Please check your connection and try again.",
+    ),
+)
+_DEFAULT_ERROR_RESPONSE = "I encountered an error processing your request. Please try again."
+
+
+# Weather changes slowly, so successful lookups are reused across workflows
+WEATHER_CACHE_TTL_SECONDS = 600
+WEATHER_CACHE_MAX_SIZE = 1024
+
+# zip_code -> (expiry time, weather data), least recently used first
+_weather_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_weather_cache_lock = threading.Lock()
+_weather_cache_hits = 0
+_weather_cache_misses = 0
+
+
+class WeatherCacheInfo(NamedTuple):
+    """Weather cache statistics, in the style of functools.lru_cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def _get_cached_weather(zip_code: str) -> Optional[Dict[str, Any]]:
+    """Return cached weather data for a zip code if it has not expired."""
+    global _weather_cache_hits, _weather_cache_misses
+
+    with _weather_cache_lock:
+        entry = _weather_cache.get(zip_code)
+        if entry is None:
+            _weather_cache_misses += 1
+            return None
+        expires_at, weather_data = entry
+        if time.monotonic() >= expires_at:
+            del _weather_cache[zip_code]
+            _weather_cache_misses += 1
+            return None
+        _weather_cache.move_to_end(zip_code)
+        _weather_cache_hits += 1
+        return weather_data
+
+
+def _cache_weather(zip_code: str, weather_data: Dict[str, Any]) -> None:
+    """Cache weather data for a zip code, evicting the oldest entry if full."""
+    with _weather_cache_lock:
+        _weather_cache[zip_code] = (
+            time.monotonic() + WEATHER_CACHE_TTL_SECONDS,
+            weather_data,
+        )
+        _weather_cache.move_to_end(zip_code)
+        if len(_weather_cache) > WEATHER_CACHE_MAX_SIZE:
+            _weather_cache.popitem(last=False)
+
+
+def weather_cache_info() -> WeatherCacheInfo:
+    """
+    Report weather cache statistics.
+
+    Returns:
+        Hit and miss counts since the last clear, plus current size
+    """
+    with _weather_cache_lock:
+        return WeatherCacheInfo(
+            hits=_weather_cache_hits,
+            misses=_weather_cache_misses,
+            maxsize=WEATHER_CACHE_MAX_SIZE,
+            currsize=len(_weather_cache),
+        )
+
+
+def clear_weather_cache() -> None:
+    """Clear cached weather data and statistics (for testing)."""
+    global _weather_cache_hits, _weather_cache_misses
+
+    with _weather_cache_lock:
+        _weather_cache.clear()
+        _weather_cache_hits = 0
+        _weather_cache_misses = 0
+
 
 class WorkflowStepType(Enum):
     """Types of workflow steps."""
@@ -30,24 +160,68 @@ class WorkflowStepType(Enum):
     AGENT_RESPONSE = "agent_response"
 
 
+class StepTemplate(NamedTuple):
+    """Static definition of a workflow step, shared by every execution."""
+
+    step_id: str
+    description: str
+    step_type: WorkflowStepType
+    depends_on: Optional[str] = None
+
+
+# The 4-step workflow. Built once; each execution only allocates step state.
+_STEP_TEMPLATES = (
+    StepTemplate(
+        "parse_user_input",
+        "Parse user message",
+        WorkflowStepType.AGENT_REASONING,
+    ),
+    StepTemplate(
+        "get_weather_data",
+        "Call weather function",
+        WorkflowStepType.TOOL_CALL,
+        "parse_user_input",
+    ),
+    StepTemplate(
+        "generate_recommendations",
+        "Generate recommendations",
+        WorkflowStepType.AGENT_REASONING,
+        "get_weather_data",
+    ),
+    StepTemplate(
+        "format_response",
+        "Format final response",
+        WorkflowStepType.AGENT_RESPONSE,
+        "generate_recommendations",
+    ),
+)
+
+
+@dataclass(slots=True, eq=False)
 class WorkflowStep:
-    """Represents a single step in the workflow."""
-
-    def __init__(
-        self,
-        step_id: str,
-        description: str,
-        step_type: WorkflowStepType,
-        depends_on: Optional[str] = None,
-    ):
-        self.step_id = step_id
-        self.description = description
-        self.step_type = step_type
-        self.depends_on = depends_on
-        self.output: Any = None
-        self.duration: float = 0
-        self.success: bool = False
-        self.error: Optional[str] = None
+    """Execution state of a single workflow step."""
+
+    template: StepTemplate
+    output: Any = None
+    duration: float = 0.0
+    success: bool = False
+    error: Optional[str] = None
+
+    @property
+    def step_id(self) -> str:
+        return self.template.step_id
+
+    @property
+    def description(self) -> str:
+        return self.template.description
+
+    @property
+    def step_type(self) -> WorkflowStepType:
+        return self.template.step_type
+
+    @property
+    def depends_on(self) -> Optional[str]:
+        return self.template.depends_on
 
 
 class WorkflowOrchestrator:
@@ -70,26 +244,23 @@ class WorkflowOrchestrator:
         """
         self.agent_service = agent_service
         self.steps: List[WorkflowStep] = []
+        self._steps_by_id: Dict[str, WorkflowStep] = {}
         self.workflow_context: Dict[str, Any] = {}
         self.telemetry = get_telemetry_service()
 
         logger.info("Workflow orchestrator initialized")
 
-    async def execute_workflow(
-        self, message: str, session_id: Optional[str] = None
-    ) -> Dict[str, Any]:
+    def _start_workflow(self, message: str, session_id: Optional[str]) -> str:
         """
-        Execute the complete workflow for a user message.
+        Reset workflow context and steps for a new message.
 
         Args:
             message: User's message
             session_id: Optional session ID for conversation continuity
 
         Returns:
-            Dict containing workflow execution results
+            Session ID for the workflow
         """
-        workflow_start = time.time()
-
         # Generate or retrieve session ID
         if not session_id:
             session_id = str(uuid.uuid4())
@@ -98,75 +269,118 @@ class WorkflowOrchestrator:
         self.workflow_context = {
             "message": message,
             "session_id": session_id,
-            "workflow_id": str(uuid.uuid4()),
-            "start_time": workflow_start,
+            "workflow_id": secrets.token_hex(16),
+            "start_time": time.perf_counter(),
         }
 
-        # Initialize workflow steps
-        self.steps = [
-            WorkflowStep(
-                "parse_user_input",
-                "Parse user message",
-                WorkflowStepType.AGENT_REASONING,
-            ),
-            WorkflowStep(
-                "get_weather_data",
-                "Call weather function",
-                WorkflowStepType.TOOL_CALL,
-                "parse_user_input",
-            ),
-            WorkflowStep(
-                "generate_recommendations",
-                "Generate recommendations",
-                WorkflowStepType.AGENT_REASONING,
-                "get_weather_data",
-            ),
-            WorkflowStep(
-                "format_response",
-                "Format final response",
-                WorkflowStepType.AGENT_RESPONSE,
-                "generate_recommendations",
-            ),
-        ]
+        # Initialize workflow step state from the shared templates
+        self.steps = [WorkflowStep(template) for template in _STEP_TEMPLATES]
+        self._steps_by_id = {step.step_id: step for step in self.steps}
 
         logger.info(
             f"Starting workflow execution: {self.workflow_context['workflow_id']}"
         )
+        return session_id
 
-        try:
-            # Execute workflow steps sequentially
-            for step in self.steps:
-                await self._execute_step(step)
-
-                # Check if step failed and handle error
-                if not step.success:
-                    return self._handle_workflow_error(step)
+    async def _run_steps(self, steps: List[WorkflowStep]) -> Optional[WorkflowStep]:
+        """
+        Execute steps as a DAG until they all succeed or one fails.
 
-            # Workflow completed successfully
-            workflow_duration = time.time() - workflow_start
+        Every step whose dependency has completed runs concurrently with
+        the others that are ready.
 
-            # Get final response from last step
-            final_response = self.steps[-1].output
+        Args:
+            steps: Steps to execute
 
-            # Log performance warning if needed
-            if workflow_duration > SC_001_RESPONSE_TIME_SECONDS:
-                logger.warning(
-                    f"Workflow duration {workflow_duration:.2f}s exceeds SC-001 threshold "
-                    f"of {SC_001_RESPONSE_TIME_SECONDS}s"
+        Returns:
+            The first failed step, or None if all steps succeeded
+        """
+        pending = list(steps)
+        while pending:
+            ready = [step for step in pending if self._is_ready(step)]
+            if not ready:
+                raise Exception(
+                    "Workflow has circular step dependencies: "
+                    + ", ".join(step.step_id for step in pending)
                 )
 
-            logger.info(f"Workflow completed successfully in {workflow_duration:.2f}s")
+            await asyncio.gather(*(self._execute_step(step) for step in ready))
 
-            # Track workflow completion
-            self.telemetry.track_event(
-                "workflow_completed",
-                {
-                    "workflow_id": self.workflow_context["workflow_id"],
-                    "duration_seconds": workflow_duration,
-                    "within_threshold": workflow_duration <= SC_001_RESPONSE_TIME_SECONDS,
-                },
+            for step in ready:
+                if not step.success:
+                    return step
+                pending.remove(step)
+
+        return None
+
+    def _complete_workflow(self) -> float:
+        """
+        Log and track successful workflow completion.
+
+        Returns:
+            Workflow duration in seconds
+        """
+        workflow_duration = time.perf_counter() - self.workflow_context["start_time"]
+
+        # Log performance warning if needed
+        if workflow_duration > SC_001_RESPONSE_TIME_SECONDS:
+            logger.warning(
+                f"Workflow duration {workflow_duration:.2f}s exceeds SC-001 threshold "
+                f"of {SC_001_RESPONSE_TIME_SECONDS}s"
             )
 
+        logger.info(f"Workflow completed successfully in {workflow_duration:.2f}s")
+
+        # Track workflow completion
+        self.telemetry.track_event(
+            "workflow_completed",
+            {
+                "workflow_id": self.workflow_context["workflow_id"],
+                "duration_seconds": workflow_duration,
+                "within_threshold": workflow_duration <= SC_001_RESPONSE_TIME_SECONDS,
+            },
+        )
+        return workflow_duration
+
+    def _track_workflow_exception(self, e: Exception) -> None:
+        """Log and track an unexpected workflow exception."""
+        logger.exception(f"Workflow execution failed: {e}")
+
+        self.telemetry.track_exception(
+            e,
+            {
+                "workflow_id": self.workflow_context.get("workflow_id", "unknown"),
+                "failed_step": self._get_current_step_id(),
+            },
+        )
+
+    async def execute_workflow(
+        self, message: str, session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute the complete workflow for a user message.
+
+        Args:
+            message: User's message
+            session_id: Optional session ID for conversation continuity
+
+        Returns:
+            Dict containing workflow execution results
+        """
+        session_id = self._start_workflow(message, session_id)
+
+        try:
+            # Check if a step failed and handle error
+            failed_step = await self._run_steps(self.steps)
+            if failed_step:
+                return self._handle_workflow_error(failed_step)
+
+            # Workflow completed successfully
+            workflow_duration = self._complete_workflow()
+
+            # Get final response from last step
+            final_response = self.steps[-1].output
+
             return {
                 "response": final_response,
                 "session_id": session_id,
@@ -174,6 +388,9 @@ class WorkflowOrchestrator:
                     "workflow_id": self.workflow_context["workflow_id"],
                     "workflow_duration": workflow_duration,
                     "steps_executed": len(self.steps),
+                    "weather_cache_hit": self.workflow_context.get(
+                        "weather_cache_hit", False
+                    ),
                     "within_threshold": workflow_duration <= SC_001_RESPONSE_TIME_SECONDS,
                     "step_durations": {
                         step.step_id: step.duration for step in self.steps
@@ -182,19 +399,10 @@ class WorkflowOrchestrator:
             }
 
         except Exception as e:
-            logger.exception(f"Workflow execution failed: {e}")
-
-            # Track workflow failure
-            self.telemetry.track_exception(
-                e,
-                {
-                    "workflow_id": self.workflow_context.get("workflow_id", "unknown"),
-                    "failed_step": self._get_current_step_id(),
-                },
-            )
+            self._track_workflow_exception(e)
 
             return {
-                "response": "I encountered an error processing your request. Please try again.",
+                "response": _DEFAULT_ERROR_RESPONSE,
                 "session_id": session_id,
                 "metadata": {
                     "workflow_id": self.workflow_context["workflow_id"],
@@ -203,6 +411,64 @@ class WorkflowOrchestrator:
                 },
             }
 
+    async def execute_workflow_stream(
+        self, message: str, session_id: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Execute the workflow, streaming the final agent response.
+
+        The preparation steps run as in execute_workflow; the agent response
+        step then yields text as the agent generates it so callers can
+        forward the first chunk after time-to-first-token. On failure the
+        fallback message is yielded instead.
+
+        Args:
+            message: User's message
+            session_id: Optional session ID for conversation continuity
+
+        Yields:
+            Response text chunks
+        """
+        session_id = self._start_workflow(message, session_id)
+        response_steps = [
+            step
+            for step in self.steps
+            if step.step_type == WorkflowStepType.AGENT_RESPONSE
+        ]
+
+        try:
+            failed_step = await self._run_steps(
+                [step for step in self.steps if step not in response_steps]
+            )
+            if failed_step:
+                yield self._handle_workflow_error(failed_step)["response"]
+                return
+
+            for step in response_steps:
+                step_start = time.perf_counter()
+                parts: List[str] = []
+                async for chunk in self.agent_service.format_with_context_stream(
+                    message, self._get_step("get_weather_data").output, session_id
+                ):
+                    parts.append(chunk)
+                    yield chunk
+
+                step.output = "".join(parts)
+                step.success = True
+                step.duration = time.perf_counter() - step_start
+                self.telemetry.track_workflow_step(
+                    step.step_id,
+                    step.step_type.value,
+                    step.success,
+                    step.duration * 1000,  # Convert to ms
+                )
+
+            self._complete_workflow()
+
+        except Exception as e:
+            self._track_workflow_exception(e)
+            yield _DEFAULT_ERROR_RESPONSE
+
     async def _execute_step(self, step: WorkflowStep) -> None:
         """
         Execute a single workflow step.
@@ -210,28 +476,29 @@ class WorkflowOrchestrator:
         Args:
             step: WorkflowStep to execute
         """
-        step_start = time.time()
+        # Check dependencies before doing any work
+        if step.depends_on:
+            prev_step = self._get_step(step.depends_on)
+            if not prev_step or not prev_step.success:
+                self._fail_step(
+                    step, f"Dependency step {step.depends_on} failed or not found", 0.0
+                )
+                return
+
+        step_start = time.perf_counter()
         logger.info(f"Executing workflow step: {step.step_id} - {step.description}")
 
         try:
-            # Check dependencies
-            if step.depends_on:
-                prev_step = self._get_step(step.depends_on)
-                if not prev_step or not prev_step.success:
-                    raise Exception(
-                        f"Dependency step {step.depends_on} failed or not found"
-                    )
-
             # Execute step based on type
             if step.step_type == WorkflowStepType.AGENT_REASONING:
                 step.output = self._execute_agent_reasoning(step)
             elif step.step_type == WorkflowStepType.TOOL_CALL:
-                step.output = self._execute_tool_call(step)
+                step.output = await self._execute_tool_call(step)
             elif step.step_type == WorkflowStepType.AGENT_RESPONSE:
                 step.output = await self._execute_agent_response(step)
 
             step.success = True
-            step.duration = time.time() - step_start
+            step.duration = time.perf_counter() - step_start
 
             # Track step completion
             self.telemetry.track_workflow_step(
@@ -244,32 +511,49 @@ class WorkflowOrchestrator:
             logger.info(f"Step {step.step_id} completed in {step.duration:.2f}s")
 
         except Exception as e:
-            step.success = False
-            step.error = str(e)
-            step.duration = time.time() - step_start
+            self._fail_step(step, str(e), time.perf_counter() - step_start)
 
-            # Track step failure
-            self.telemetry.track_workflow_step(
-                step.step_id,
-                step.step_type.value,
-                step.success,
-                step.duration * 1000,
-                {"error": str(e)},
-            )
+    def _fail_step(self, step: WorkflowStep, error: str, duration: float) -> None:
+        """
+        Record and track a failed workflow step.
+
+        Args:
+            step: WorkflowStep that failed
+            error: Error message
+            duration: Time spent on the step in seconds
+        """
+        step.success = False
+        step.error = error
+        step.duration = duration
+
+        # Track step failure
+        self.telemetry.track_workflow_step(
+            step.step_id,
+            step.step_type.value,
+            step.success,
+            step.duration * 1000,
+            {"error": error},
+        )
 
-            logger.error(f"Step {step.step_id} failed: {e}")
+        logger.error(f"Step {step.step_id} failed: {error}")
 
     def _execute_agent_reasoning(self, step: WorkflowStep) -> Any:
         """Execute agent reasoning step."""
         if step.step_id == "parse_user_input":
             # Extract zip code from message (simple pattern matching for POC)
+            # Scan once and keep every zip code for multi-location requests
             message = self.workflow_context["message"]
-            zip_match = re.search(r"\b\d{5}\b", message)
+            zip_codes = _find_zip_codes(message)
+            self.workflow_context["zip_codes"] = zip_codes
 
-            if zip_match:
-                zip_code = zip_match.group(0)
+            if zip_codes:
+                zip_code = zip_codes[0]
                 logger.info(f"Extracted zip code: {zip_code}")
-                return {"zip_code": zip_code, "has_zip_code": True}
+                return {
+                    "zip_code": zip_code,
+                    "zip_codes": zip_codes,
+                    "has_zip_code": True,
+                }
             else:
                 logger.warning("No zip code found in message")
                 return {"has_zip_code": False}
@@ -284,7 +568,7 @@ class WorkflowOrchestrator:
 
         return None
 
-    def _execute_tool_call(self, step: WorkflowStep) -> Any:
+    async def _execute_tool_call(self, step: WorkflowStep) -> Any:
         """Execute tool call step (get_weather)."""
         if step.step_id == "get_weather_data":
             parse_step = self._get_step("parse_user_input")
@@ -294,12 +578,19 @@ class WorkflowOrchestrator:
 
             zip_code = parse_step.output["zip_code"]
 
+            weather_data = _get_cached_weather(zip_code)
+            self.workflow_context["weather_cache_hit"] = weather_data is not None
+            if weather_data is not None:
+                logger.info(f"Weather cache hit for zip code: {zip_code}")
+                return weather_data
+
             # Call weather function via agent service
-            weather_data = self.agent_service._call_weather_function(zip_code)
+            weather_data = await self.agent_service._call_weather_function(zip_code)
 
             if "error" in weather_data:
                 raise Exception(f"Weather function error: {weather_data['error']}")
 
+            _cache_weather(zip_code, weather_data)
             return weather_data
 
         return None
@@ -311,21 +602,31 @@ class WorkflowOrchestrator:
             message = self.workflow_context["message"]
             session_id = self.workflow_context["session_id"]
 
-            # Call agent service to get final formatted response
-            # This includes the full conversation with tool results
-            response = await self.agent_service.process_message_simple(
-                message, session_id
+            # Format the weather data already fetched by get_weather_data
+            # instead of letting the agent repeat the tool call
+            response = await self.agent_service.format_with_context(
+                message, self._get_step("get_weather_data").output, session_id
             )
             return response
 
         return ""
 
+    def _is_ready(self, step: WorkflowStep) -> bool:
+        """
+        Check whether a step can be scheduled.
+
+        A step is ready once its dependency has succeeded. Steps with an
+        unknown dependency are also scheduled so _execute_step reports
+        the missing dependency as a step failure.
+        """
+        if not step.depends_on:
+            return True
+        dependency = self._get_step(step.depends_on)
+        return dependency is None or dependency.success
+
     def _get_step(self, step_id: str) -> Optional[WorkflowStep]:
         """Get a workflow step by ID."""
-        for step in self.steps:
-            if step.step_id == step_id:
-                return step
-        return None
+        return self._steps_by_id.get(step_id)
 
     def _get_current_step_id(self) -> str:
         """Get ID of currently executing step."""
@@ -349,14 +650,10 @@ class WorkflowOrchestrator:
         )
 
         # Determine appropriate fallback message
-        if "zip code" in error_message.lower():
-            response = "I couldn't find a valid zip code in your message. Please provide a 5-digit US zip code."
-        elif "timeout" in error_message.lower():
-            response = "The weather service is taking too long to respond. Please try again in a moment."
-        elif "network" in error_message.lower():
-            response = "I'm having trouble connecting to the weather service. Please check your connection and try again."
-        else:
-            response = "I encountered an error processing your request. Please try again."
+        response = next(
+            (text for pattern, text in _ERROR_MAP if pattern.search(error_message)),
+            _DEFAULT_ERROR_RESPONSE,
+        )
 
         return {
             "response": response,
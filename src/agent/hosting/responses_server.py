@@ -6,16 +6,53 @@ Hosted Agent protocol, allowing the same agent code to run in both
 Container Apps and Foundry Hosted deployments.
 """
 
+import importlib.util
+import json
 import logging
 import os
+import sys
 import uuid
-from typing import Any, AsyncIterator, Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    # Fall back to stdlib json when orjson is not installed
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 # Default port for Foundry protocol
 FOUNDRY_PORT = 8088
 
+# Server connection limits (overridable via environment)
+DEFAULT_LIMIT_CONCURRENCY = 100
+DEFAULT_BACKLOG = 2048
+
+_NO_USER_MESSAGE_ERROR = {
+    "error": {
+        "code": "invalid_request",
+        "message": "No user message found in request",
+    }
+}
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse a JSON request body, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _sse_event(payload: Dict[str, Any]) -> str:
+    """Format a payload as a server-sent event data line."""
+    if orjson is not None:
+        data = orjson.dumps(payload).decode()
+    else:
+        data = json.dumps(payload)
+    return f"data: {data}\n\n"
+
 
 class ResponsesServer:
     """
@@ -31,38 +68,27 @@ class ResponsesServer:
 
         Args:
             agent_service: Optional AgentService instance. If not provided,
-                         one will be created when start() is called.
+                         one will be created when the app starts up.
         """
         self._agent_service = agent_service
         self._app = None
         self._conversations: Dict[str, List[Dict[str, str]]] = {}
 
-    async def handle_responses(
+    async def _prepare_request(
         self,
         messages: List[Dict[str, str]],
-        conversation_id: Optional[str] = None,
-        stream: bool = False,
-        model: Optional[str] = None,
-    ) -> Dict[str, Any]:
+        conversation_id: Optional[str],
+    ) -> Tuple[str, List[Dict[str, str]], Optional[str]]:
         """
-        Handle a /responses API request.
+        Resolve conversation state for a request.
 
         Args:
             messages: List of conversation messages
             conversation_id: Optional conversation ID for continuity
-            stream: Whether to stream the response
-            model: Optional model override
 
         Returns:
-            Response dictionary with content and metadata
+            Tuple of (conversation_id, history, latest user message)
         """
-        # Import here to avoid circular imports
-        from agent.core.agent_service import AgentService
-
-        # Ensure agent service is initialized
-        if self._agent_service is None:
-            self._agent_service = AgentService()
-
         # Generate or retrieve conversation ID
         if not conversation_id:
             conversation_id = str(uuid.uuid4())
@@ -82,13 +108,33 @@ class ResponsesServer:
                 user_message = msg.get("content", "")
                 break
 
+        return conversation_id, history, user_message
+
+    async def handle_responses(
+        self,
+        messages: List[Dict[str, str]],
+        conversation_id: Optional[str] = None,
+        stream: bool = False,
+        model: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Handle a /responses API request.
+
+        Args:
+            messages: List of conversation messages
+            conversation_id: Optional conversation ID for continuity
+            stream: Whether to stream the response
+            model: Optional model override
+
+        Returns:
+            Response dictionary with content and metadata
+        """
+        conversation_id, history, user_message = await self._prepare_request(
+            messages, conversation_id
+        )
+
         if not user_message:
-            return {
-                "error": {
-                    "code": "invalid_request",
-                    "message": "No user message found in request",
-                }
-            }
+            return _NO_USER_MESSAGE_ERROR
 
         try:
             # Process through agent service
@@ -143,6 +189,10 @@ class ResponsesServer:
         """
         Handle a streaming /responses API request.
 
+        Text deltas are forwarded as the agent generates them, so the
+        first chunk arrives after time-to-first-token rather than after
+        the full response.
+
         Args:
             messages: List of conversation messages
             conversation_id: Optional conversation ID
@@ -151,40 +201,51 @@ class ResponsesServer:
         Yields:
             Server-sent event strings
         """
-        # For now, get full response and simulate streaming
-        result = await self.handle_responses(
-            messages=messages,
-            conversation_id=conversation_id,
-            stream=False,
-            model=model,
+        conversation_id, history, user_message = await self._prepare_request(
+            messages, conversation_id
         )
 
-        if "error" in result:
-            yield f"data: {result}\n\n"
+        if not user_message:
+            yield _sse_event(_NO_USER_MESSAGE_ERROR)
             return
 
-        # Simulate streaming by yielding character by character
-        content = result["choices"][0]["message"]["content"]
-        response_id = result["id"]
-        model_name = result["model"]
+        response_id = str(uuid.uuid4())
+        model_name = model or os.getenv("AZURE_AI_MODEL_DEPLOYMENT_NAME", "gpt-4")
+
+        def chunk(delta: Dict[str, str], finish_reason: Optional[str]) -> str:
+            return _sse_event(
+                {
+                    "id": response_id,
+                    "object": "response.chunk",
+                    "model": model_name,
+                    "conversation_id": conversation_id,
+                    "choices": [
+                        {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                    ],
+                }
+            )
 
         # Start event
-        yield f"data: {{'id': '{response_id}', 'object': 'response.chunk', 'model': '{model_name}', 'choices': [{{'index': 0, 'delta': {{'role': 'assistant'}}, 'finish_reason': null}}]}}\n\n"
-
-        # Content chunks (simplified - in production would chunk better)
-        for char in content:
-            chunk = {
-                "id": response_id,
-                "object": "response.chunk",
-                "model": model_name,
-                "choices": [
-                    {"index": 0, "delta": {"content": char}, "finish_reason": None}
-                ],
-            }
-            yield f"data: {chunk}\n\n"
+        yield chunk({"role": "assistant"}, None)
+
+        content_parts: List[str] = []
+        try:
+            async for text in self._agent_service.process_message_stream(
+                user_message, conversation_id
+            ):
+                content_parts.append(text)
+                yield chunk({"content": text}, None)
+        except Exception as e:
+            logger.exception(f"Error streaming responses request: {e}")
+            yield _sse_event({"error": {"code": "internal_error", "message": str(e)}})
+            return
+
+        # Update conversation history
+        history.append({"role": "assistant", "content": "".join(content_parts)})
+        self._conversations[conversation_id] = history
 
         # End event
-        yield f"data: {{'id': '{response_id}', 'object': 'response.chunk', 'model': '{model_name}', 'choices': [{{'index': 0, 'delta': {{}}, 'finish_reason': 'stop'}}]}}\n\n"
+        yield chunk({}, "stop")
         yield "data: [DONE]\n\n"
 
     def create_app(self):
@@ -196,17 +257,38 @@ class ResponsesServer:
         """
         try:
             from fastapi import FastAPI, Request
-            from fastapi.responses import JSONResponse, StreamingResponse
+            from fastapi.responses import (
+                JSONResponse,
+                ORJSONResponse,
+                StreamingResponse,
+            )
         except ImportError:
             raise ImportError(
                 "FastAPI is required for ResponsesServer. "
                 "Install with: pip install fastapi uvicorn"
             )
 
+        # Serialize responses with orjson when it is installed
+        response_class = ORJSONResponse if orjson is not None else JSONResponse
+
+        @asynccontextmanager
+        async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+            """Create the agent service on startup and close it on shutdown."""
+            if self._agent_service is None:
+                # Import here to avoid circular imports
+                from agent.core.agent_service import AgentService
+
+                self._agent_service = await AgentService.create()
+            yield
+            if self._agent_service is not None:
+                await self._agent_service.aclose()
+
         app = FastAPI(
             title="Weather Clothing Advisor Agent",
             description="Foundry Responses API compatible agent server",
             version="1.0.0",
+            default_response_class=response_class,
+            lifespan=lifespan,
         )
 
         @app.get("/health")
@@ -232,9 +314,9 @@ class ResponsesServer:
             - model: Optional model override
             """
             try:
-                body = await request.json()
+                body = _json_loads(await request.body())
             except Exception:
-                return JSONResponse(
+                return response_class(
                     status_code=400,
                     content={"error": {"code": "invalid_json", "message": "Invalid JSON body"}},
                 )
@@ -272,9 +354,9 @@ class ResponsesServer:
             )
 
             if "error" in result:
-                return JSONResponse(status_code=500, content=result)
+                return response_class(status_code=500, content=result)
 
-            return JSONResponse(content=result)
+            return response_class(content=result)
 
         self._app = app
         return app
@@ -297,7 +379,34 @@ class ResponsesServer:
 
         app = self.create_app()
         logger.info(f"Starting Responses API server on {host}:{port}")
-        uvicorn.run(app, host=host, port=port)
+        uvicorn.run(
+            app,
+            host=host,
+            port=port,
+            limit_concurrency=int(
+                os.getenv("UVICORN_LIMIT_CONCURRENCY", DEFAULT_LIMIT_CONCURRENCY)
+            ),
+            backlog=int(os.getenv("UVICORN_BACKLOG", DEFAULT_BACKLOG)),
+            **_server_options(),
+        )
+
+
+def _server_options() -> Dict[str, str]:
+    """
+    Select the fastest available event loop and HTTP parser.
+
+    uvloop and httptools ship with uvicorn[standard] on Linux; fall back
+    to uvicorn's defaults when either is missing (e.g. on Windows).
+
+    Returns:
+        Keyword arguments for uvicorn.run
+    """
+    options: Dict[str, str] = {}
+    if sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None:
+        options["loop"] = "uvloop"
+    if importlib.util.find_spec("httptools") is not None:
+        options["http"] = "httptools"
+    return options
 
 
 def create_responses_server(agent_service: Any = None) -> ResponsesServer:
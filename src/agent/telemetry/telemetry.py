@@ -27,6 +27,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Fraction of traces sampled and exported to Application Insights
+DEFAULT_SAMPLING_RATIO = 0.1
+
+# Attribute value types OpenTelemetry accepts without coercion
+_NATIVE_ATTRIBUTE_TYPES = (str, bool, int, float)
+
 
 class TelemetryService:
     """Manages Application Insights telemetry for agent deployment."""
@@ -64,9 +70,16 @@ class TelemetryService:
             elif os.getenv("CONTAINER_APP_NAME"):
                 deployment_type = "container-app"
 
-            # Configure Azure Monitor with custom resource attributes
+            sampling_ratio = float(
+                os.getenv("TELEMETRY_SAMPLING_RATIO", DEFAULT_SAMPLING_RATIO)
+            )
+
+            # Configure Azure Monitor with custom resource attributes.
+            # Sampling is decided per trace, so unsampled spans are
+            # non-recording and skip attribute work below.
             configure_azure_monitor(
                 connection_string=connection_string,
+                sampling_ratio=sampling_ratio,
                 resource=Resource.create(
                     {
                         "service.name": service_name,
@@ -85,13 +98,43 @@ class TelemetryService:
 
             logger.info(
                 f"Application Insights telemetry configured successfully "
-                f"(deployment={deployment_type})"
+                f"(deployment={deployment_type}, sampling_ratio={sampling_ratio})"
             )
 
         except Exception as e:
             logger.exception("Error configuring Application Insights")
             self.enabled = False
 
+    @staticmethod
+    def _set_properties(
+        span: Any,
+        properties: Optional[Dict[str, Any]],
+        attributes: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Set standard attributes and custom properties on a span.
+
+        Everything is applied in a single set_attributes call. Skipped for
+        non-recording (unsampled) spans so nothing is built or coerced.
+        Values OpenTelemetry accepts natively are passed through as-is;
+        anything else is converted with str().
+
+        Args:
+            span: Span to annotate
+            properties: Additional properties to track
+            attributes: Standard attributes for the span type
+        """
+        if not (properties or attributes) or not span.is_recording():
+            return
+
+        merged = dict(attributes) if attributes else {}
+        if properties:
+            for key, value in properties.items():
+                merged[key] = (
+                    value if isinstance(value, _NATIVE_ATTRIBUTE_TYPES) else str(value)
+                )
+        span.set_attributes(merged)
+
     def track_request(
         self, name: str, properties: Optional[Dict[str, Any]] = None
     ) -> Optional[Any]:
@@ -112,9 +155,7 @@ class TelemetryService:
             span = self.tracer.start_span(name)
 
             # Add custom properties as span attributes
-            if properties:
-                for key, value in properties.items():
-                    span.set_attribute(key, str(value))
+            self._set_properties(span, properties)
 
             return span
 
@@ -137,11 +178,7 @@ class TelemetryService:
 
         try:
             with self.tracer.start_as_current_span(name) as span:
-                span.set_attribute("event.type", "custom")
-
-                if properties:
-                    for key, value in properties.items():
-                        span.set_attribute(key, str(value))
+                self._set_properties(span, properties, {"event.type": "custom"})
 
             logger.info(f"Tracked event: {name}")
 
@@ -163,13 +200,16 @@ class TelemetryService:
 
         try:
             with self.tracer.start_as_current_span("exception") as span:
-                span.set_attribute("exception.type", type(exception).__name__)
-                span.set_attribute("exception.message", str(exception))
-                span.record_exception(exception)
-
-                if properties:
-                    for key, value in properties.items():
-                        span.set_attribute(key, str(value))
+                if span.is_recording():
+                    span.record_exception(exception)
+                    self._set_properties(
+                        span,
+                        properties,
+                        {
+                            "exception.type": type(exception).__name__,
+                            "exception.message": str(exception),
+                        },
+                    )
 
             logger.error(f"Tracked exception: {type(exception).__name__}")
 
@@ -201,14 +241,16 @@ class TelemetryService:
 
         try:
             with self.tracer.start_as_current_span(name) as span:
-                span.set_attribute("dependency.type", dependency_type)
-                span.set_attribute("dependency.target", target)
-                span.set_attribute("dependency.success", success)
-                span.set_attribute("dependency.duration_ms", duration_ms)
-
-                if properties:
-                    for key, value in properties.items():
-                        span.set_attribute(key, str(value))
+                self._set_properties(
+                    span,
+                    properties,
+                    {
+                        "dependency.type": dependency_type,
+                        "dependency.target": target,
+                        "dependency.success": success,
+                        "dependency.duration_ms": duration_ms,
+                    },
+                )
 
             logger.debug(f"Tracked dependency: {name} ({dependency_type})")
 
@@ -238,14 +280,16 @@ class TelemetryService:
 
         try:
             with self.tracer.start_as_current_span(f"workflow.step.{step_id}") as span:
-                span.set_attribute("workflow.step_id", step_id)
-                span.set_attribute("workflow.step_type", step_type)
-                span.set_attribute("workflow.success", success)
-                span.set_attribute("workflow.duration_ms", duration_ms)
-
-                if properties:
-                    for key, value in properties.items():
-                        span.set_attribute(key, str(value))
+                self._set_properties(
+                    span,
+                    properties,
+                    {
+                        "workflow.step_id": step_id,
+                        "workflow.step_type": step_type,
+                        "workflow.success": success,
+                        "workflow.duration_ms": duration_ms,
+                    },
+                )
 
             logger.debug(f"Tracked workflow step: {step_id} ({step_type})")
 
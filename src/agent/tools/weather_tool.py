@@ -5,17 +5,46 @@ This module provides the get_weather tool that can be registered
 with the agent framework.
 """
 
+import asyncio
 import json
 import logging
 import os
 import time
-from typing import Any, Callable, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    # Fall back to stdlib json when orjson is not installed
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    # Async weather calls are unavailable without httpx
+    httpx = None
 
 from agent.core.constants import SC_001_RESPONSE_TIME_SECONDS
 from agent.telemetry.telemetry import get_telemetry_service
 
+if TYPE_CHECKING:
+    import requests
+
 logger = logging.getLogger(__name__)
 
+# Connection pool size, and the cap on concurrent lookups in get_weather_many
+MAX_CONCURRENT_REQUESTS = 16
+
+# Bytes read per chunk when streaming a weather API response
+RESPONSE_CHUNK_SIZE = 64 * 1024
+
+
+def _parse_json(data: Union[bytes, bytearray]) -> Dict[str, Any]:
+    """Parse a weather API response body, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class WeatherTool:
     """
@@ -37,6 +66,58 @@ class WeatherTool:
             raise ValueError("WEATHER_API_URL environment variable is required")
         self.weather_api_url: str = url
         self.telemetry = get_telemetry_service()
+        self._session: Optional["requests.Session"] = None
+        self._async_client: Optional["httpx.AsyncClient"] = None
+
+    def _track_call(
+        self, zip_code: str, start_time: float, error: Optional[str] = None
+    ) -> None:
+        """
+        Record the weather API call as a telemetry dependency.
+
+        Args:
+            zip_code: Zip code that was requested
+            start_time: perf_counter value taken before the request
+            error: Error description if the call failed
+        """
+        properties = {"zip_code": zip_code}
+        if error is not None:
+            properties["error"] = error
+
+        self.telemetry.track_dependency(
+            name="get_weather",
+            dependency_type="HTTP",
+            target=self.weather_api_url,
+            success=error is None,
+            duration_ms=(time.perf_counter() - start_time) * 1000,
+            properties=properties,
+        )
+
+    def _timeout_error(self, zip_code: str, start_time: float) -> Dict[str, Any]:
+        """Track a timed-out call and build its error response."""
+        self._track_call(zip_code, start_time, error="timeout")
+        logger.error(f"Weather API timeout for zip code: {zip_code}")
+        return {
+            "error": {
+                "error_code": "TIMEOUT",
+                "message": "Weather request timed out",
+                "details": f"Request exceeded {SC_001_RESPONSE_TIME_SECONDS} seconds",
+            }
+        }
+
+    def _api_error(
+        self, zip_code: str, start_time: float, e: Exception
+    ) -> Dict[str, Any]:
+        """Track a failed call and build its error response."""
+        self._track_call(zip_code, start_time, error=str(e))
+        logger.exception(f"Error calling weather API for zip code: {zip_code}")
+        return {
+            "error": {
+                "error_code": "API_ERROR",
+                "message": "Error calling weather API",
+                "details": str(e),
+            }
+        }
 
     def get_weather(self, zip_code: str) -> Dict[str, Any]:
         """
@@ -50,32 +131,27 @@ class WeatherTool:
         """
         import requests
 
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
             logger.info(f"Getting weather for zip code: {zip_code}")
 
-            # Call weather API container
-            response = requests.get(
+            # Call weather API container over the pooled session, reading
+            # the body in chunks into a single buffer
+            with self._get_session().get(
                 f"{self.weather_api_url}/api/weather",
                 params={"zip_code": zip_code},
                 timeout=SC_001_RESPONSE_TIME_SECONDS,
-            )
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+                body = bytearray()
+                for chunk in response.iter_content(RESPONSE_CHUNK_SIZE):
+                    body.extend(chunk)
 
-            response.raise_for_status()
-            result = response.json()
-
-            duration_ms = (time.time() - start_time) * 1000
-
-            # Track dependency
-            self.telemetry.track_dependency(
-                name="get_weather",
-                dependency_type="HTTP",
-                target=self.weather_api_url,
-                success=True,
-                duration_ms=duration_ms,
-                properties={"zip_code": zip_code},
-            )
+            result = _parse_json(body)
+
+            self._track_call(zip_code, start_time)
 
             logger.info(
                 f"Weather data retrieved for {result.get('location', 'unknown location')}"
@@ -83,45 +159,116 @@ class WeatherTool:
             return result
 
         except requests.exceptions.Timeout:
-            duration_ms = (time.time() - start_time) * 1000
-
-            self.telemetry.track_dependency(
-                name="get_weather",
-                dependency_type="HTTP",
-                target=self.weather_api_url,
-                success=False,
-                duration_ms=duration_ms,
-                properties={"zip_code": zip_code, "error": "timeout"},
+            return self._timeout_error(zip_code, start_time)
+        except Exception as e:
+            return self._api_error(zip_code, start_time, e)
+
+    async def get_weather_async(self, zip_code: str) -> Dict[str, Any]:
+        """
+        Retrieve current weather data without blocking the event loop.
+
+        Requests share one pooled httpx.AsyncClient per tool, so concurrent
+        lookups reuse keep-alive connections. Call aclose() when done.
+
+        Args:
+            zip_code: 5-digit US zip code
+
+        Returns:
+            Weather data dictionary or error response
+        """
+        if httpx is None:
+            raise ImportError(
+                "httpx is required for async weather calls. "
+                "Install with: pip install httpx"
             )
 
-            logger.error(f"Weather API timeout for zip code: {zip_code}")
-            return {
-                "error": {
-                    "error_code": "TIMEOUT",
-                    "message": "Weather request timed out",
-                    "details": f"Request exceeded {SC_001_RESPONSE_TIME_SECONDS} seconds",
-                }
-            }
-        except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
-
-            self.telemetry.track_dependency(
-                name="get_weather",
-                dependency_type="HTTP",
-                target=self.weather_api_url,
-                success=False,
-                duration_ms=duration_ms,
-                properties={"zip_code": zip_code, "error": str(e)},
+        start_time = time.perf_counter()
+
+        try:
+            logger.info(f"Getting weather for zip code: {zip_code}")
+
+            response = await self._get_async_client().get(
+                f"{self.weather_api_url}/api/weather",
+                params={"zip_code": zip_code},
             )
 
-            logger.exception(f"Error calling weather API for zip code: {zip_code}")
-            return {
-                "error": {
-                    "error_code": "API_ERROR",
-                    "message": "Error calling weather API",
-                    "details": str(e),
-                }
-            }
+            response.raise_for_status()
+            result = _parse_json(response.content)
+
+            self._track_call(zip_code, start_time)
+
+            logger.info(
+                f"Weather data retrieved for {result.get('location', 'unknown location')}"
+            )
+            return result
+
+        except httpx.TimeoutException:
+            return self._timeout_error(zip_code, start_time)
+        except Exception as e:
+            return self._api_error(zip_code, start_time, e)
+
+    async def get_weather_many(self, zip_codes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve weather for several zip codes concurrently.
+
+        At most MAX_CONCURRENT_REQUESTS lookups are in flight at once,
+        matching the size of the connection pool.
+
+        Args:
+            zip_codes: 5-digit US zip codes
+
+        Returns:
+            Mapping of zip code to weather data or error response
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def fetch(zip_code: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_weather_async(zip_code)
+
+        unique_zip_codes = list(dict.fromkeys(zip_codes))
+        results = await asyncio.gather(*(fetch(z) for z in unique_zip_codes))
+        return dict(zip(unique_zip_codes, results))
+
+    def _get_session(self) -> "requests.Session":
+        """Get the pooled HTTP session, creating it on first use."""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=MAX_CONCURRENT_REQUESTS,
+                pool_maxsize=MAX_CONCURRENT_REQUESTS,
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def _get_async_client(self) -> "httpx.AsyncClient":
+        """Get the pooled async HTTP client, creating it on first use."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                timeout=SC_001_RESPONSE_TIME_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONCURRENT_REQUESTS,
+                    max_keepalive_connections=MAX_CONCURRENT_REQUESTS,
+                ),
+            )
+        return self._async_client
+
+    def close(self) -> None:
+        """Close the pooled HTTP session, if one was created."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    async def aclose(self) -> None:
+        """Close the pooled async HTTP client, if one was created."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
 
     def get_tool_function(self) -> Callable[[str], str]:
         """
@@ -81,6 +81,33 @@ def test_agent_exists(client: AIProjectClient) -> bool:
         return False
 
 
+# Stream events that end a run
+RUN_TERMINAL_EVENTS = frozenset({
+    "thread.run.completed",
+    "thread.run.failed",
+    "thread.run.cancelled",
+    "thread.run.expired",
+})
+
+
+def run_agent(client: AIProjectClient, thread_id: str) -> None:
+    """
+    Run the agent on a thread and return as soon as the run ends.
+
+    Streams run events instead of polling, falling back to
+    create_and_process when the SDK has no streaming support.
+    """
+    stream_run = getattr(client.agents.runs, "stream", None)
+    if stream_run is None:
+        client.agents.runs.create_and_process(thread_id=thread_id, agent_id=AGENT_ID)
+        return
+
+    with stream_run(thread_id=thread_id, agent_id=AGENT_ID) as stream:
+        for event_type, _, _ in stream:
+            if event_type in RUN_TERMINAL_EVENTS:
+                break
+
+
 def test_agent_response(client: AIProjectClient, test_case: Dict) -> Dict:
     """Test agent with a specific message."""
     print("\n" + "=" * 60)
@@ -104,18 +131,17 @@ def test_agent_response(client: AIProjectClient, test_case: Dict) -> Dict:
         )
 
         # Run agent
-        run = client.agents.runs.create_and_process(
-            thread_id=thread_id,
-            agent_id=AGENT_ID
-        )
+        run_agent(client, thread_id)
 
         duration = time.time() - start_time
 
-        # Get response
-        messages = client.agents.messages.list(thread_id=thread_id)
-        message_list = list(messages)
-        latest_message = message_list[0]
-        agent_response = latest_message.content[0].text.value
+        # Get response: fetch only the newest message instead of the whole thread
+        messages = client.agents.messages.list(
+            thread_id=thread_id, order="desc", limit=1
+        )
+        latest_message = next(iter(messages))
+        text_messages = latest_message.text_messages
+        agent_response = text_messages[-1].text.value if text_messages else ""
 
         print(f"\nResponse ({duration:.2f}s):")
         print(f"  {agent_response[:200]}...")
@@ -19,9 +19,6 @@ import pytest
 from typing import Dict, Any
 from unittest.mock import MagicMock, patch, AsyncMock
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-
 
 class TestConstants:
     """Test the constants module."""
@@ -36,6 +33,13 @@ class TestConstants:
         assert classify_temperature(75) == "Warm"
         assert classify_temperature(95) == "Hot"
 
+        # Range lower bounds are inclusive
+        assert classify_temperature(31.9) == "Winter"
+        assert classify_temperature(32) == "Cool"
+        assert classify_temperature(50) == "Moderate"
+        assert classify_temperature(70) == "Warm"
+        assert classify_temperature(85) == "Hot"
+
     def test_wind_protection_thresholds(self):
         """Test wind protection determination."""
         from agent.core.constants import requires_wind_protection, is_high_wind
@@ -74,6 +78,12 @@ class TestModels:
         weather2 = WeatherData.from_dict(data)
         assert weather2.temperature == weather.temperature
 
+        # Weather snapshots are immutable
+        from dataclasses import FrozenInstanceError
+
+        with pytest.raises(FrozenInstanceError):
+            weather.temperature = 50.0
+
     def test_clothing_item_creation(self):
         """Test ClothingItem model."""
         from agent.core.models import ClothingItem, ClothingCategory
@@ -90,6 +100,14 @@ class TestModels:
 
         data = item.to_dict()
         assert data["category"] == "outerwear"
+        assert ClothingCategory("outerwear") is ClothingCategory.OUTERWEAR
+        assert len({category.bit for category in ClothingCategory}) == 4
+
+        # Items are immutable so templates can be shared
+        from dataclasses import FrozenInstanceError
+
+        with pytest.raises(FrozenInstanceError):
+            item.priority = 2
 
     def test_responses_api_request(self):
         """Test ResponsesApiRequest model for Foundry compatibility."""
@@ -131,6 +149,9 @@ class TestClothingLogic:
         assert 3 <= len(recommendation.items) <= 5  # SC-002 requirement
         assert any("coat" in item.name.lower() for item in recommendation.items)
 
+        coat = recommendation.items[0]
+        assert coat.reason == "Essential for 25°F freezing temperatures"
+
     def test_generate_recommendations_hot(self):
         """Test recommendations for hot weather."""
         from agent.core.clothing_logic import ClothingAdvisor
@@ -177,6 +198,23 @@ class TestClothingLogic:
         assert any("waterproof" in item.name.lower() or "rain" in item.name.lower()
                    for item in recommendation.items)
 
+    def test_enforce_item_count_pads_to_minimum(self):
+        """Test short item lists are padded with footwear, then filler."""
+        from agent.core.clothing_logic import ClothingAdvisor
+        from agent.core.models import ClothingCategory, ClothingItem
+
+        advisor = ClothingAdvisor()
+        coat = ClothingItem("Coat", ClothingCategory.OUTERWEAR, "Cold", 1)
+        boots = ClothingItem("Boots", ClothingCategory.FOOTWEAR, "Snow", 1)
+
+        items = advisor._enforce_item_count([coat], "Winter", None)
+        assert [i.name for i in items] == [
+            "Coat", "Comfortable closed-toe shoes", "Long pants"
+        ]
+
+        items = advisor._enforce_item_count([coat, boots], "Hot", None)
+        assert [i.name for i in items] == ["Coat", "Boots", "Light hat or cap"]
+
 
 class TestAgentService:
     """Test the agent service."""
@@ -184,7 +222,7 @@ class TestAgentService:
     @pytest.fixture
     def mock_weather_api(self):
         """Mock weather API responses."""
-        with patch("requests.get") as mock_get:
+        with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.json.return_value = {
@@ -224,17 +262,276 @@ class TestAgentService:
             assert service.weather_api_url == "http://test:8080"
             assert service.agent is None  # Mock mode
 
-    def test_call_weather_function(self, mock_weather_api):
+    @pytest.mark.asyncio
+    async def test_create_async(self, mock_weather_api):
+        """Test async AgentService factory."""
+        from agent.core.agent_service import AgentService
+
+        with patch("agent.core.agent_service.AGENT_FRAMEWORK_AVAILABLE", False):
+            service = await AgentService.create(weather_api_url="http://test:8080")
+
+        assert service.weather_api_url == "http://test:8080"
+        assert service.instructions
+
+    def test_load_agent_instructions_cached(self, mock_weather_api, tmp_path):
+        """Test prompts are re-read only when the file changes."""
+        from agent.core.agent_service import AgentService, _read_prompts_cached
+
+        prompts = tmp_path / "agent-prompts.md"
+        prompts.write_text("v1")
+        with patch("agent.core.agent_service.AGENT_FRAMEWORK_AVAILABLE", False), \
+                patch("agent.core.agent_service._DOCKER_PROMPTS_FILE", prompts):
+            service = AgentService(weather_api_url="http://test:8080")
+            assert service.instructions == "v1"
+
+            hits = _read_prompts_cached.cache_info().hits
+            assert service._load_agent_instructions() == "v1"
+            assert _read_prompts_cached.cache_info().hits == hits + 1
+
+            prompts.write_text("v2")
+            os.utime(prompts, ns=(0, prompts.stat().st_mtime_ns + 1_000_000))
+            assert service._load_agent_instructions() == "v2"
+
+    @pytest.mark.asyncio
+    async def test_call_weather_function(self, mock_weather_api):
         """Test weather function call."""
         from agent.core.agent_service import AgentService
 
         with patch("agent.core.agent_service.AGENT_FRAMEWORK_AVAILABLE", False):
             service = AgentService(weather_api_url="http://test:8080")
-            result = service._call_weather_function("10001")
+            result = await service._call_weather_function("10001")
 
             assert result["location"] == "New York, NY"
             assert result["temperature"] == 45.0
 
+            # The pooled client is reused across calls
+            client = service._http
+            await service._call_weather_function("10002")
+            assert service._http is client
+
+            await service.aclose()
+            assert service._http is None
+
+    @pytest.mark.asyncio
+    async def test_call_weather_function_retries_gateway_errors(self, mock_weather_api):
+        """Test a gateway error from the weather API is retried."""
+        from agent.core.agent_service import AgentService
+
+        with patch("agent.core.agent_service.AGENT_FRAMEWORK_AVAILABLE", False):
+            service = AgentService(weather_api_url="http://test:8080")
+
+        ok_response = mock_weather_api.return_value
+        mock_weather_api.side_effect = [MagicMock(status_code=503), ok_response]
+
+        with patch("agent.core.agent_service._RETRY_BACKOFF_SECONDS", 0):
+            result = await service._call_weather_function("10001")
+
+        assert result["temperature"] == 45.0
+        assert mock_weather_api.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_call_weather_function_invalid_zip(self, mock_weather_api):
+        """Test malformed and rejected zip codes skip the weather API."""
+        import httpx
+        from agent.core.agent_service import AgentService
+
+        with patch("agent.core.agent_service.AGENT_FRAMEWORK_AVAILABLE", False):
+            service = AgentService(weather_api_url="http://test:8080")
+
+        result = await service._call_weather_function("1234a")
+        assert result["error"]["error_code"] == "INVALID_ZIP"
+
+        # Non-ASCII digits are not valid zip codes
+        result = await service._call_weather_function("١٠٠٠١")
+        assert result["error"]["error_code"] == "INVALID_ZIP"
+        mock_weather_api.assert_not_called()
+
+        # A zip code the API rejects gets the same error on every call,
+        # and later calls are answered locally
+        mock_weather_api.return_value.status_code = 404
+        mock_weather_api.return_value.raise_for_status.side_effect = (
+            httpx.HTTPStatusError("404", request=MagicMock(), response=MagicMock())
+        )
+        first = await service._call_weather_function("00000")
+        second = await service._call_weather_function("00000")
+
+        assert first == second
+        assert first["error"]["error_code"] == "INVALID_ZIP"
+        mock_weather_api.assert_called_once()
+
+    def test_invalid_zip_cache_is_bounded(self, mock_weather_api):
+        """Test the oldest rejected zip code is evicted at the size limit."""
+        from agent.core.agent_service import AgentService
+
+        with patch("agent.core.agent_service.AGENT_FRAMEWORK_AVAILABLE", False):
+            service = AgentService(weather_api_url="http://test:8080")
+
+        with patch("agent.core.agent_service.INVALID_ZIP_CACHE_MAX_SIZE", 2):
+            for zip_code in ("00001", "00002", "00003"):
+                service._remember_invalid_zip(zip_code)
+
+        assert list(service._invalid_zips) == ["00002", "00003"]
+        assert not service._is_known_invalid_zip("00001")
+        assert service._is_known_invalid_zip("00003")
+
+    @pytest.mark.asyncio
+    async def test_format_with_context_disables_tools(self, mock_weather_api):
+        """Test the final formatting call passes weather data without tools."""
+        from agent.core.agent_service import AgentService
+
+        with patch("agent.core.agent_service.AGENT_FRAMEWORK_AVAILABLE", False):
+            service = AgentService(weather_api_url="http://test:8080")
+
+        service.agent = MagicMock()
+        service.agent.run = AsyncMock(return_value=MagicMock(text="Wear a coat"))
+
+        result = await service.format_with_context(
+            "What to wear in 10001?", {"temperature": 45.0}, "s1"
+        )
+
+        assert result == "Wear a coat"
+        prompt = service.agent.run.call_args.args[0]
+        assert '"temperature": 45.0' in prompt
+        assert service.agent.run.call_args.kwargs["tool_choice"] == "none"
+        mock_weather_api.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_process_message_reuses_session_thread(self, mock_weather_api):
+        """Test that a session keeps one agent thread across turns."""
+        from agent.core.agent_service import AgentService
+
+        with patch("agent.core.agent_service.AGENT_FRAMEWORK_AVAILABLE", False):
+            service = AgentService(weather_api_url="http://test:8080")
+
+        service.agent = MagicMock()
+        service.agent.run = AsyncMock(return_value=MagicMock(text="Wear a coat"))
+
+        await service.process_message("What to wear in 10001?", session_id="s1")
+        await service.process_message("And tomorrow?", session_id="s1")
+
+        service.agent.get_new_thread.assert_called_once()
+        _, thread = service.sessions["s1"]
+        for call in service.agent.run.call_args_list:
+            assert call.kwargs["thread"] is thread
+
+    @pytest.mark.asyncio
+    async def test_concurrent_turns_serialized_per_session(self, mock_weather_api):
+        """Test that overlapping turns on one session do not interleave."""
+        import asyncio
+
+        from agent.core.agent_service import AgentService
+
+        with patch("agent.core.agent_service.AGENT_FRAMEWORK_AVAILABLE", False):
+            service = AgentService(weather_api_url="http://test:8080")
+
+        active = []
+
+        async def run(message, **kwargs):
+            active.append(message)
+            assert len(active) == 1
+            await asyncio.sleep(0)
+            active.remove(message)
+            return MagicMock(text=f"Re: {message}")
+
+        service.agent = MagicMock()
+        service.agent.run = run
+
+        results = await asyncio.gather(
+            service.process_message_simple("first", "s1"),
+            service.process_message_simple("second", "s1"),
+        )
+
+        assert results == ["Re: first", "Re: second"]
+
+    def test_token_reused_until_near_expiry(self):
+        """Test Azure tokens are cached until close to expiry."""
+        import time
+
+        from agent.core import agent_service
+
+        credential = MagicMock()
+        credential.get_token.return_value = MagicMock(
+            token="t1", expires_on=time.time() + 3600
+        )
+
+        with patch.object(agent_service, "_get_credential", return_value=credential), \
+                patch.dict(agent_service._token_cache, clear=True):
+            assert agent_service._get_token() == "t1"
+            assert agent_service._get_token() == "t1"
+            credential.get_token.assert_called_once()
+
+            credential.get_token.return_value = MagicMock(
+                token="t2", expires_on=time.time() + 3600
+            )
+            agent_service._token_cache[
+                agent_service._COGNITIVE_SERVICES_SCOPE
+            ].expires_on = time.time() + 60
+            assert agent_service._get_token() == "t2"
+
+    @pytest.mark.asyncio
+    async def test_stream_turn_serialized_with_run_turn(self, mock_weather_api):
+        """Test a streaming turn and a regular turn on one session do not interleave."""
+        import asyncio
+
+        from agent.core.agent_service import AgentService
+
+        with patch("agent.core.agent_service.AGENT_FRAMEWORK_AVAILABLE", False):
+            service = AgentService(weather_api_url="http://test:8080")
+
+        events = []
+
+        async def run_stream(message, **kwargs):
+            events.append("stream start")
+            for text in ("Wear ", "a coat"):
+                await asyncio.sleep(0)
+                yield MagicMock(text=text)
+            events.append("stream end")
+
+        async def run(message, **kwargs):
+            events.append("run")
+            return MagicMock(text="Bring an umbrella")
+
+        service.agent = MagicMock()
+        service.agent.run_stream = run_stream
+        service.agent.run = run
+
+        async def stream_turn():
+            return [
+                text async for text in service.process_message_stream("first", "s1")
+            ]
+
+        async def run_turn():
+            # Let the streaming turn start first
+            await asyncio.sleep(0)
+            return await service.process_message_simple("second", "s1")
+
+        chunks, response = await asyncio.gather(stream_turn(), run_turn())
+
+        assert chunks == ["Wear ", "a coat"]
+        assert response == "Bring an umbrella"
+        assert events == ["stream start", "stream end", "run"]
+
+    def test_sessions_bounded(self, mock_weather_api):
+        """Test that idle and least recently used sessions are evicted."""
+        from agent.core.agent_service import AgentService
+
+        with patch("agent.core.agent_service.AGENT_FRAMEWORK_AVAILABLE", False):
+            service = AgentService(weather_api_url="http://test:8080")
+
+        service.agent = MagicMock()
+        service.agent.get_new_thread.side_effect = lambda: object()
+        service.max_sessions = 2
+
+        first = service._get_thread("s1")
+        service._get_thread("s2")
+        assert service._get_thread("s1") is first
+        service._get_thread("s3")
+        assert list(service.sessions) == ["s1", "s3"]
+
+        service.session_ttl = 0
+        assert service._get_thread("s1") is not first
+        assert list(service.sessions) == ["s1"]
+
 
 class TestResponsesServer:
     """Test the Foundry Responses API server."""
@@ -281,6 +578,233 @@ class TestResponsesServer:
         assert "error" in result
         assert result["error"]["code"] == "invalid_request"
 
+    @pytest.mark.asyncio
+    async def test_handle_responses_stream(self, mock_agent_service):
+        """Test streaming forwards agent text deltas as SSE chunks."""
+        import json
+        from agent.hosting.responses_server import ResponsesServer
+
+        async def stream(message, session_id):
+            for text in ("Wear ", "a warm coat!"):
+                yield text
+
+        mock_agent_service.process_message_stream = stream
+        server = ResponsesServer(agent_service=mock_agent_service)
+
+        events = [
+            event
+            async for event in server.handle_responses_stream(
+                messages=[{"role": "user", "content": "What to wear in 10001?"}],
+                conversation_id="test-123",
+            )
+        ]
+
+        assert events[-1] == "data: [DONE]\n\n"
+        chunks = [json.loads(event[len("data: "):]) for event in events[:-1]]
+        deltas = [c["choices"][0]["delta"].get("content", "") for c in chunks]
+        assert "".join(deltas) == "Wear a warm coat!"
+        assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+        assert server._conversations["test-123"][-1]["content"] == "Wear a warm coat!"
+
+    def test_shutdown_closes_agent_service(self, mock_agent_service):
+        """Test the app closes the agent service's HTTP client on shutdown."""
+        from fastapi.testclient import TestClient
+
+        from agent.hosting.responses_server import ResponsesServer
+
+        mock_agent_service.aclose = AsyncMock()
+        server = ResponsesServer(agent_service=mock_agent_service)
+
+        with TestClient(server.create_app()) as client:
+            assert client.get("/health").status_code == 200
+            mock_agent_service.aclose.assert_not_called()
+
+        mock_agent_service.aclose.assert_awaited_once()
+
+    def test_startup_creates_agent_service(self, mock_agent_service):
+        """Test the app creates the agent service once on startup."""
+        from fastapi.testclient import TestClient
+
+        from agent.core.agent_service import AgentService
+        from agent.hosting.responses_server import ResponsesServer
+
+        mock_agent_service.aclose = AsyncMock()
+        server = ResponsesServer()
+
+        with patch.object(
+            AgentService, "create", AsyncMock(return_value=mock_agent_service)
+        ) as create:
+            with TestClient(server.create_app()) as client:
+                assert server._agent_service is mock_agent_service
+                for _ in range(2):
+                    response = client.post(
+                        "/responses",
+                        json={"input": [{"role": "user", "content": "Hi"}]},
+                    )
+                    assert response.status_code == 200
+
+        create.assert_awaited_once()
+        mock_agent_service.aclose.assert_awaited_once()
+
+    def test_start_uses_uvloop_and_httptools(self, mock_agent_service):
+        """Test start() enables uvloop/httptools when they are installed."""
+        from agent.hosting import responses_server
+        from agent.hosting.responses_server import ResponsesServer
+
+        uvicorn = MagicMock()
+        server = ResponsesServer(agent_service=mock_agent_service)
+
+        with patch.dict(sys.modules, {"uvicorn": uvicorn}), patch.object(
+            responses_server.sys, "platform", "linux"
+        ), patch.object(
+            responses_server.importlib.util, "find_spec", return_value=object()
+        ):
+            server.start(port=9000)
+
+        kwargs = uvicorn.run.call_args.kwargs
+        assert kwargs["port"] == 9000
+        assert kwargs["loop"] == "uvloop"
+        assert kwargs["http"] == "httptools"
+        assert kwargs["limit_concurrency"] == responses_server.DEFAULT_LIMIT_CONCURRENCY
+
+
+class TestWorkflowOrchestrator:
+    """Test the workflow orchestrator."""
+
+    @pytest.fixture(autouse=True)
+    def clear_weather_cache(self):
+        """Start each test with an empty weather cache."""
+        from agent.core.workflow_orchestrator import clear_weather_cache
+
+        clear_weather_cache()
+        yield
+        clear_weather_cache()
+
+    def test_parse_user_input_extracts_all_zip_codes(self):
+        """Test zip codes are extracted once and kept in the workflow context."""
+        from agent.core.workflow_orchestrator import (
+            StepTemplate,
+            WorkflowOrchestrator,
+            WorkflowStep,
+            WorkflowStepType,
+        )
+
+        orchestrator = WorkflowOrchestrator(agent_service=MagicMock())
+        orchestrator.workflow_context = {"message": "Compare 10001 and 94102"}
+        step = WorkflowStep(
+            StepTemplate(
+                "parse_user_input",
+                "Parse user message",
+                WorkflowStepType.AGENT_REASONING,
+            )
+        )
+
+        output = orchestrator._execute_agent_reasoning(step)
+
+        assert output["zip_code"] == "10001"
+        assert output["zip_codes"] == ["10001", "94102"]
+        assert orchestrator.workflow_context["zip_codes"] == ["10001", "94102"]
+
+    def test_find_zip_codes(self):
+        """Test zip code extraction matches standalone 5-digit numbers only."""
+        from agent.core.workflow_orchestrator import _find_zip_codes
+
+        assert _find_zip_codes("What should I wear in Chicago?") == []
+        assert _find_zip_codes("Visiting (10001) then 90210.") == ["10001", "90210"]
+        assert _find_zip_codes("Order 123456 or a12345") == []
+        assert _find_zip_codes("Visiting ١٠٠٠١ for 2 days") == []
+
+    @pytest.mark.asyncio
+    async def test_execute_workflow(self):
+        """Test the workflow runs every step and returns the agent response."""
+        from agent.core.workflow_orchestrator import WorkflowOrchestrator
+
+        agent_service = MagicMock()
+        agent_service._call_weather_function = AsyncMock(
+            return_value={"temperature": 45.0}
+        )
+        agent_service.format_with_context = AsyncMock(return_value="Wear a coat")
+
+        orchestrator = WorkflowOrchestrator(agent_service=agent_service)
+        result = await orchestrator.execute_workflow("What to wear in 10001?", "s1")
+
+        assert result["response"] == "Wear a coat"
+        assert result["metadata"]["steps_executed"] == 4
+        agent_service._call_weather_function.assert_awaited_once_with("10001")
+        agent_service.format_with_context.assert_awaited_once_with(
+            "What to wear in 10001?", {"temperature": 45.0}, "s1"
+        )
+
+        # A repeat lookup for the same zip code is served from the cache
+        result = await orchestrator.execute_workflow("And in 10001 tonight?", "s1")
+
+        assert result["metadata"]["weather_cache_hit"]
+        agent_service._call_weather_function.assert_called_once()
+
+        from agent.core.workflow_orchestrator import weather_cache_info
+
+        info = weather_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    @pytest.mark.asyncio
+    async def test_execute_workflow_stops_at_failed_step(self):
+        """Test steps depending on a failed step are never scheduled."""
+        from agent.core.workflow_orchestrator import WorkflowOrchestrator
+
+        agent_service = MagicMock()
+        agent_service.format_with_context = AsyncMock()
+
+        orchestrator = WorkflowOrchestrator(agent_service=agent_service)
+        result = await orchestrator.execute_workflow("What should I wear today?")
+
+        assert result["metadata"]["failed_step"] == "get_weather_data"
+        assert "zip code" in result["response"]
+        agent_service._call_weather_function.assert_not_called()
+        agent_service.format_with_context.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_execute_step_with_failed_dependency(self):
+        """Test a step whose dependency failed is marked failed without running."""
+        from agent.core.workflow_orchestrator import WorkflowOrchestrator
+
+        agent_service = MagicMock()
+        orchestrator = WorkflowOrchestrator(agent_service=agent_service)
+        orchestrator._start_workflow("What to wear in 10001?", "s1")
+        step = orchestrator._get_step("get_weather_data")
+
+        await orchestrator._execute_step(step)
+
+        assert not step.success
+        assert step.error == "Dependency step parse_user_input failed or not found"
+        agent_service._call_weather_function.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_execute_workflow_stream(self):
+        """Test the final agent response is streamed chunk by chunk."""
+        from agent.core.workflow_orchestrator import WorkflowOrchestrator
+
+        async def stream(message, weather_data, session_id):
+            assert weather_data == {"temperature": 45.0}
+            for text in ("Wear ", "a coat"):
+                yield text
+
+        agent_service = MagicMock()
+        agent_service._call_weather_function = AsyncMock(
+            return_value={"temperature": 45.0}
+        )
+        agent_service.format_with_context_stream = stream
+
+        orchestrator = WorkflowOrchestrator(agent_service=agent_service)
+        chunks = [
+            chunk
+            async for chunk in orchestrator.execute_workflow_stream(
+                "What to wear in 10001?", "s1"
+            )
+        ]
+
+        assert chunks == ["Wear ", "a coat"]
+        assert orchestrator._get_step("format_response").output == "Wear a coat"
+
 
 class TestTelemetry:
     """Test the telemetry module."""
@@ -313,17 +837,64 @@ class TestTelemetry:
             if old_val:
                 os.environ["APPLICATIONINSIGHTS_CONNECTION_STRING"] = old_val
 
+    def test_properties_skipped_for_unsampled_span(self):
+        """Test properties are not set on non-recording spans."""
+        from agent.telemetry.telemetry import TelemetryService
+
+        span = MagicMock()
+        span.is_recording.return_value = False
+        TelemetryService._set_properties(span, {"key": "value"})
+        span.set_attributes.assert_not_called()
+
+        span.is_recording.return_value = True
+        TelemetryService._set_properties(span, {"key": 1, "items": [1]})
+        span.set_attributes.assert_called_once_with({"key": 1, "items": "[1]"})
+
+    def test_dependency_attributes_set_in_one_call(self):
+        """Test track_dependency batches standard attributes and properties."""
+        from agent.telemetry.telemetry import TelemetryService
+
+        old_val = os.environ.pop("APPLICATIONINSIGHTS_CONNECTION_STRING", None)
+
+        try:
+            service = TelemetryService()
+            service.enabled = True
+            service.tracer = MagicMock()
+            span = service.tracer.start_as_current_span.return_value.__enter__.return_value
+            span.is_recording.return_value = True
+
+            service.track_dependency(
+                "weather_api", "HTTP", "http://test", True, 12.5, {"zip_code": "10001"}
+            )
+
+            span.set_attributes.assert_called_once_with(
+                {
+                    "dependency.type": "HTTP",
+                    "dependency.target": "http://test",
+                    "dependency.success": True,
+                    "dependency.duration_ms": 12.5,
+                    "zip_code": "10001",
+                }
+            )
+            span.set_attribute.assert_not_called()
+        finally:
+            if old_val:
+                os.environ["APPLICATIONINSIGHTS_CONNECTION_STRING"] = old_val
+
 
 class TestWeatherTool:
     """Test the weather tool module."""
 
     @pytest.fixture
     def mock_requests(self):
-        """Mock requests module."""
-        with patch("requests.get") as mock_get:
+        """Mock the pooled requests session."""
+        import json
+
+        with patch("requests.Session.get") as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = 200
-            mock_response.json.return_value = {
+            mock_response.__enter__.return_value = mock_response
+            mock_response.iter_content.return_value = [json.dumps({
                 "zip_code": "10001",
                 "location": "New York, NY",
                 "temperature": 45.0,
@@ -331,7 +902,7 @@ class TestWeatherTool:
                 "humidity": 65,
                 "wind_speed": 12.0,
                 "description": "Cloudy",
-            }
+            }).encode()]
             mock_get.return_value = mock_response
             yield mock_get
 
@@ -341,9 +912,15 @@ class TestWeatherTool:
 
         tool = WeatherTool(weather_api_url="http://test:8080")
         result = tool.get_weather("10001")
+        session = tool._session
+        tool.get_weather("10002")
 
         assert result["location"] == "New York, NY"
-        mock_requests.assert_called_once()
+        assert tool._session is session
+        assert mock_requests.call_count == 2
+
+        tool.close()
+        assert tool._session is None
 
     def test_weather_tool_timeout(self, mock_requests):
         """Test WeatherTool handles timeout."""
@@ -358,6 +935,99 @@ class TestWeatherTool:
         assert "error" in result
         assert result["error"]["error_code"] == "TIMEOUT"
 
+    @pytest.mark.asyncio
+    async def test_weather_tool_get_weather_async(self):
+        """Test WeatherTool.get_weather_async() reuses one pooled client."""
+        import httpx
+        from agent.tools.weather_tool import WeatherTool
+
+        request = httpx.Request("GET", "http://test:8080/api/weather")
+        response = httpx.Response(
+            200, json={"zip_code": "10001", "location": "New York, NY"}, request=request
+        )
+
+        tool = WeatherTool(weather_api_url="http://test:8080")
+        with patch.object(
+            httpx.AsyncClient, "get", AsyncMock(return_value=response)
+        ) as mock_get:
+            result = await tool.get_weather_async("10001")
+            client = tool._async_client
+            await tool.get_weather_async("10002")
+
+        assert result["location"] == "New York, NY"
+        assert tool._async_client is client
+        assert mock_get.await_count == 2
+
+        await tool.aclose()
+        assert tool._async_client is None
+
+    @pytest.mark.asyncio
+    async def test_weather_tool_get_weather_many(self):
+        """Test WeatherTool.get_weather_many() fetches each zip code once."""
+        from agent.tools.weather_tool import WeatherTool
+
+        tool = WeatherTool(weather_api_url="http://test:8080")
+
+        async def fake_get_weather(zip_code):
+            return {"zip_code": zip_code}
+
+        with patch.object(
+            tool, "get_weather_async", AsyncMock(side_effect=fake_get_weather)
+        ) as mock_get:
+            results = await tool.get_weather_many(["10001", "90210", "10001"])
+
+        assert results == {
+            "10001": {"zip_code": "10001"},
+            "90210": {"zip_code": "90210"},
+        }
+        assert mock_get.await_count == 2
+
+
+class TestFoundryRegistration:
+    """Test the Foundry agent registration script."""
+
+    @pytest.fixture
+    def register_agent(self, monkeypatch):
+        """Import deploy/foundry/register_agent.py as a module."""
+        foundry_dir = os.path.join(
+            os.path.dirname(__file__), "..", "deploy", "foundry"
+        )
+        monkeypatch.syspath_prepend(foundry_dir)
+        import register_agent
+
+        return register_agent
+
+    def test_list_agents_filters_by_deployment_type(self, register_agent):
+        """Test list_agents filters on the latest version's metadata."""
+        def fake_agent(name, metadata):
+            agent = MagicMock()
+            agent.name = name
+            agent.versions.latest.metadata = metadata
+            return agent
+
+        agents = [
+            fake_agent("foundry", {"deployment_type": "foundry-agent"}),
+            fake_agent("external", {"deployment_type": "external-agent"}),
+            fake_agent("untagged", None),
+        ]
+        client = MagicMock()
+        client.agents.list.return_value = iter(agents)
+
+        registration = register_agent.FoundryAgentRegistration.__new__(
+            register_agent.FoundryAgentRegistration
+        )
+        with patch.object(
+            register_agent.FoundryAgentRegistration,
+            "client",
+            new_callable=lambda: property(lambda self: client),
+        ):
+            names = [agent.name for agent in registration.list_agents("foundry-agent")]
+            assert names == ["foundry"]
+
+            client.agents.list.return_value = iter(agents)
+            names = [agent.name for agent in registration.list_agents()]
+            assert names == ["foundry", "external", "untagged"]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])